@@ -0,0 +1,198 @@
+import gc
+import itertools
+import sys
+import threading
+import time
+import types
+
+# Each thread gets a small number once and sticks to the same stripe
+# of every account
+_thread_numbers = itertools.count()
+_thread_slot = threading.local()
+
+
+def _thread_number():
+    try:
+        return _thread_slot.number
+    except AttributeError:
+        _thread_slot.number = next(_thread_numbers)
+        return _thread_slot.number
+
+
+class BankAccount:
+    """
+    Deposits are appended to one of a few striped ledgers, picked by
+    thread, without taking a lock: list.append is atomic. Reading the
+    balance folds every ledger into it, taking only the entries that were
+    there when it looked, so it is always exact. A ledger that grows past
+    fold_at entries is folded by the depositor that filled it.
+
+    Ledgers are created on a stripe's first deposit, so an account only
+    used from one thread carries one list. With slots, an account that has
+    no ledgers yet is smaller than a plain __dict__ object; one ledger makes
+    it about the same size, all eight about twice the size. The lock and
+    ledgers are the price of exact, contention-free deposits, see the sizes
+    printed by benchmark().
+    """
+    __slots__ = ("__balance", "__ledgers", "__stripes", "__fold_lock")
+    fold_at = 4096
+
+    def __init__(self, balance=1000, stripes=8) -> None:
+        self.__balance = balance
+        self.__ledgers = []  # stripe -> list, or None until first used
+        self.__stripes = stripes
+        self.__fold_lock = threading.Lock()
+
+    def __ledger(self, stripe):
+        with self.__fold_lock:
+            ledgers = self.__ledgers
+            if stripe >= len(ledgers):
+                ledgers.extend([None] * (stripe + 1 - len(ledgers)))
+            if ledgers[stripe] is None:
+                ledgers[stripe] = []
+            return ledgers[stripe]
+
+    def deposit(self, amount):
+        if amount <= 0:
+            raise ValueError("Deposit amount must be positive")
+        stripe = _thread_number() % self.__stripes
+        try:
+            ledger = self.__ledgers[stripe]
+        except IndexError:
+            ledger = None
+        if ledger is None:  # an empty ledger is reused, only a missing one takes the lock
+            ledger = self.__ledger(stripe)
+        ledger.append(amount)
+        if len(ledger) >= self.fold_at:
+            with self.__fold_lock:
+                self.__fold(ledger)
+
+    def __fold(self, ledger):
+        # Caller holds __fold_lock. Entries appended meanwhile land after
+        # `count` and stay for the next fold
+        if ledger is None:
+            return
+        count = len(ledger)
+        self.__balance += sum(ledger[:count])
+        del ledger[:count]
+
+    def withdraw(self, amount):
+        if amount <= 0:
+            raise ValueError("Withdrawal amount must be positive")
+        with self.__fold_lock:
+            for ledger in self.__ledgers:
+                self.__fold(ledger)
+            if amount > self.__balance:
+                raise ValueError("Insufficient balance")
+            self.__balance -= amount
+
+    @property
+    def balance(self):
+        with self.__fold_lock:
+            for ledger in self.__ledgers:
+                self.__fold(ledger)
+            return self.__balance
+
+
+# The two obvious alternatives, for the benchmark
+class UnsafeBankAccount:
+    def __init__(self) -> None:
+        self.__balance = 1000
+
+    def deposit(self, amount):
+        balance = self.__balance
+        time.sleep(0)  # the gap between read and write that loses updates
+        self.__balance = balance + amount
+
+    @property
+    def balance(self):
+        return self.__balance
+
+
+class LockedBankAccount:
+    __slots__ = ("__balance", "__lock")
+
+    def __init__(self) -> None:
+        self.__balance = 1000
+        self.__lock = threading.Lock()
+
+    def deposit(self, amount):
+        with self.__lock:
+            self.__balance += amount
+
+    @property
+    def balance(self):
+        with self.__lock:
+            return self.__balance
+
+
+def deep_size(account):
+    # The account and everything only it refers to: __dict__, ledgers, lock.
+    # Classes, functions and modules are shared and not counted
+    seen, pending, size = set(), [account], 0
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen or isinstance(obj, (type, types.FunctionType, types.ModuleType)):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        pending.extend(gc.get_referents(obj))
+        if hasattr(obj, "__dict__"):
+            pending.append(obj.__dict__)  # not always a referent, 3.11+ keeps it inline until asked
+    return size
+
+
+def benchmark(deposits=200_000, thread_counts=(1, 2, 4, 8, 16)):
+    print(f"{deposits:,} deposits of 1 per run")
+    print(f"{'threads':>7} {'unsafe':>22} {'one lock':>13} {'striped':>13}")
+    for threads in thread_counts:
+        row = []
+        for account in (UnsafeBankAccount(), LockedBankAccount(), BankAccount()):
+            per_thread = deposits // threads
+            count = 2_000 if isinstance(account, UnsafeBankAccount) else per_thread  # sleep(0) is slow
+            barrier = threading.Barrier(threads + 1)
+
+            def work():
+                deposit = account.deposit
+                barrier.wait()
+                for _ in range(count):
+                    deposit(1)
+
+            workers = [threading.Thread(target=work) for _ in range(threads)]
+            for worker in workers:
+                worker.start()
+            barrier.wait()
+            start = time.perf_counter()
+            for worker in workers:
+                worker.join()
+            elapsed = time.perf_counter() - start
+            lost = 1000 + count * threads - account.balance
+            row.append(f"{count * threads / elapsed:9,.0f}/s" + (f" lost={lost}" if lost else ""))
+        print(f"{threads:>7} {row[0]:>22} {row[1]:>13} {row[2]:>13}")
+
+    idle, single, busy = BankAccount(), BankAccount(), BankAccount()
+    single.deposit(1)
+    workers = [threading.Thread(target=busy.deposit, args=(1,)) for _ in range(16)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    busy.balance  # fold, the ledgers stay allocated but empty
+    print("bytes per account, whole object graph:")
+    print(f"  plain __dict__, unsafe        {deep_size(UnsafeBankAccount()):5}")
+    print(f"  slots + one lock              {deep_size(LockedBankAccount()):5}")
+    print(f"  striped, no deposits yet      {deep_size(idle):5}")
+    print(f"  striped, one thread           {deep_size(single):5}")
+    print(f"  striped, all 8 stripes in use {deep_size(busy):5}")
+
+
+ba = BankAccount()
+ba.deposit(500)
+ba.withdraw(200)
+print(ba.balance)
+try:
+    print(ba.__balance)
+except AttributeError as error:
+    print("private:", error)
+
+benchmark()
@@ -0,0 +1,201 @@
+import operator
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+class Student:
+    # Constructor
+    def __init__(self, name, age) -> None:
+        self.name = name
+        self.age = age
+
+    def study(self):
+        print("Studying....")
+
+
+class StudentView:
+    """
+    A Student-shaped window on one row of a StudentStore, two slots and no
+    copy of the data. Views are made on demand and can be thrown away.
+    """
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store, row):
+        self._store = store
+        self._row = row
+
+    @property
+    def name(self):
+        return self._store.names[self._row]
+
+    @property
+    def age(self):
+        return self._store.ages[self._row]
+
+    def study(self):
+        print("Studying....")
+
+    def __repr__(self):
+        return f"Student(name={self.name!r}, age={self.age})"
+
+
+class StudentStore:
+    """
+    Students as columns: one list of interned names and one unsigned byte
+    per age. by_name maps a name to its row, or to an array of rows once a
+    name repeats. The age index is the row numbers sorted by age, rebuilt
+    with a counting sort on the first range query after an insert.
+    """
+    def __init__(self):
+        self.names = []
+        self.ages = array("B")
+        self.by_name = {}
+        self._by_age = array("I")
+        self._sorted_ages = array("B")
+        self._age_index_stale = False
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name, age):
+        # Everything is checked before any column is touched, a rejected
+        # student leaves no half row behind
+        age = operator.index(age)
+        if not 0 <= age <= 255:
+            raise ValueError(f"Age out of range: {age}")
+        name = sys.intern(name)
+        row = len(self.names)
+        self.names.append(name)
+        self.ages.append(age)
+        rows = self.by_name.get(name)
+        if rows is None:
+            self.by_name[name] = row
+        elif isinstance(rows, int):
+            self.by_name[name] = array("I", (rows, row))
+        else:
+            rows.append(row)
+        self._age_index_stale = True
+        return StudentView(self, row)
+
+    def extend(self, students):
+        for name, age in students:
+            self.add(name, age)
+
+    def find_by_name(self, name):
+        rows = self.by_name.get(name)
+        if rows is None:
+            return []
+        if isinstance(rows, int):
+            return [StudentView(self, rows)]
+        return [StudentView(self, row) for row in rows]
+
+    def _age_index(self):
+        if self._age_index_stale:
+            # Counting sort: ages are 0-255, so this is linear in the rows
+            counts = [0] * 257
+            for age in self.ages:
+                counts[age + 1] += 1
+            sorted_ages = array("B", b"".join(bytes((age,)) * counts[age + 1] for age in range(256)))
+            for age in range(256):
+                counts[age + 1] += counts[age]
+            by_age = array("I", bytes(4 * len(self.ages)))
+            for row, age in enumerate(self.ages):
+                by_age[counts[age]] = row
+                counts[age] += 1
+            self._by_age = by_age
+            self._sorted_ages = sorted_ages
+            self._age_index_stale = False
+        return self._by_age, self._sorted_ages
+
+    def age_range_rows(self, low, high):
+        # Row numbers with low <= age <= high, in age order, as one array slice
+        by_age, sorted_ages = self._age_index()
+        return by_age[bisect_left(sorted_ages, low):bisect_right(sorted_ages, high)]
+
+    def age_range(self, low, high):
+        return (StudentView(self, row) for row in self.age_range_rows(low, high))
+
+    def count_age_range(self, low, high):
+        _, sorted_ages = self._age_index()
+        return bisect_right(sorted_ages, high) - bisect_left(sorted_ages, low)
+
+
+def allocated(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, size
+
+
+def best_of(query, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        query()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def build_store(rows):
+    store = StudentStore()
+    store.extend(rows)
+    store._age_index()
+    return store
+
+
+def benchmark(records=1_000_000, distinct_names=20_000, seed=3):
+    rng = random.Random(seed)
+    pool = [f"student{i:05d}" for i in range(distinct_names)]
+    rows = [(rng.choice(pool), rng.randint(17, 30)) for _ in range(records)]
+
+    # A fresh string per record, the way names come out of a parser or a
+    # database driver, built inside the measurement for both layouts
+    def parsed():
+        return ((name.encode().decode(), age) for name, age in rows)
+
+    students, object_bytes = allocated(lambda: [Student(name, age) for name, age in parsed()])
+    store, store_bytes = allocated(lambda: build_store(parsed()))
+
+    target = pool[1234]
+    queries = (
+        ("name == target",
+         lambda: [s for s in students if s.name == target],
+         lambda: store.find_by_name(target)),
+        ("20 <= age <= 21, rows",
+         lambda: [s for s in students if 20 <= s.age <= 21],
+         lambda: store.age_range_rows(20, 21)),
+        ("20 <= age <= 21, views",
+         lambda: [s for s in students if 20 <= s.age <= 21],
+         lambda: list(store.age_range(20, 21))),
+        ("count 20 <= age <= 21",
+         lambda: sum(1 for s in students if 20 <= s.age <= 21),
+         lambda: store.count_age_range(20, 21)),
+    )
+
+    print(f"{records:,} students, {distinct_names:,} distinct names")
+    print(f"memory per record : list of Student {object_bytes / records:6.1f} bytes, "
+          f"StudentStore {store_bytes / records:6.1f} bytes (with indexes)")
+    for name, scan, indexed in queries:
+        print(f"{name:<23} scan {best_of(scan) * 1000:8.2f}ms   store {best_of(indexed) * 1000:8.3f}ms")
+
+
+s1 = Student(name="Alice", age=28)
+s2 = Student(name="Bob", age=29)
+
+print(s1.name, s2.name)
+
+
+s1.study()
+
+store = StudentStore()
+store.extend([("Alice", 28), ("Bob", 29), ("Carol", 22), ("Alice", 19)])
+print(store.find_by_name("Alice"))
+print(list(store.age_range(20, 28)))
+
+benchmark()
@@ -1,5 +1,4 @@
 import json
-from bs4 import BeautifulSoup
 from abc import ABC, abstractmethod
 
 class DataProviderInterface(ABC):
@@ -21,6 +20,9 @@ class XMLDataProvider(DataProviderInterface):
         self.data = None
 
     def collect_data(self):
+        # bs4 is only imported once an XML provider is actually used
+        from bs4 import BeautifulSoup
+
         with open("data.xml", encoding="utf-8") as file:
             data = file.read()
         bs_xml = BeautifulSoup(data, "xml")
@@ -1,5 +1,6 @@
 import json
-from bs4 import BeautifulSoup
+from types import MappingProxyType
+from parsed_data_cache import parsed_data_cache
 from abc import ABC, abstractmethod
 
 class DataProviderInterface(ABC):
@@ -21,10 +22,17 @@ class XMLDataProvider(DataProviderInterface):
         self.data = None
 
     def collect_data(self):
-        with open("data.xml", encoding="utf-8") as file:
+        self.data = parsed_data_cache.load("data.xml", self.parse)
+
+    @staticmethod
+    def parse(path):
+        # bs4 is only imported once an XML provider is actually used. The
+        # tree is cached and shared by every provider, never modify it
+        from bs4 import BeautifulSoup
+
+        with open(path, encoding="utf-8") as file:
             data = file.read()
-        bs_xml = BeautifulSoup(data, "xml")
-        self.data = bs_xml
+        return BeautifulSoup(data, "xml")
     
     def get_value(self, key):
         value = self.data.find(key)
@@ -46,9 +54,13 @@ class JSONDataProvider(JSONDataProviderInterface):
         self.data = None
 
     def read_json_data(self):
-        with open("data.json", encoding="utf-8") as file:
-            data = json.load(file)
-        self.data = data
+        self.data = parsed_data_cache.load("data.json", self.parse)
+
+    @staticmethod
+    def parse(path):
+        # Cached and shared by every provider, hence read-only
+        with open(path, encoding="utf-8") as file:
+            return MappingProxyType(json.load(file))
     
     def get_value_from_json(self, key):
         return self.data.get(key)
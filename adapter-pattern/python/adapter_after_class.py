@@ -3,7 +3,8 @@ Adapter class with class based implementation
 """
 import json
 from abc import ABC, abstractmethod
-from bs4 import BeautifulSoup
+from types import MappingProxyType
+from parsed_data_cache import parsed_data_cache
 
 
 class DataProviderInterface(ABC):
@@ -43,11 +44,18 @@ class XMLDataProvider(DataProviderInterface):
         self.data = None
 
     def collect_data(self):
-        with open("data.xml", encoding="utf-8") as file:
+        self.data = parsed_data_cache.load("data.xml", self.parse)
+
+    @staticmethod
+    def parse(path):
+        # bs4 is only imported once an XML provider is actually used. The
+        # tree is cached and shared by every provider, never modify it
+        from bs4 import BeautifulSoup
+
+        with open(path, encoding="utf-8") as file:
             data = file.read()
         print("test")
-        bs_xml = BeautifulSoup(data, "xml")
-        self.data = bs_xml
+        return BeautifulSoup(data, "xml")
     
     def get_value(self, key):
         value = self.data.find(key)
@@ -69,18 +77,26 @@ class JSONDataProvider(JSONDataProviderInterface):
         self.data = None
 
     def read_json_data(self):
-        with open("data.json", encoding="utf-8") as file:
-            data = json.load(file)
-        self.data = data
+        self.data = parsed_data_cache.load("data.json", self.parse)
+
+    @staticmethod
+    def parse(path):
+        # Cached and shared by every provider, hence read-only
+        with open(path, encoding="utf-8") as file:
+            return MappingProxyType(json.load(file))
     
     def get_value_from_json(self, key):
         return self.data.get(key)
 
 class JSONtoXMLAdapter(JSONDataProvider, XMLDataProvider):
-    
-    def collect_data(self):
+
+    def __init__(self):
+        super().__init__()
+        # One provider for the adapter's lifetime, collect_data only reloads it
         self.json_data_provider = JSONDataProvider()
-        self.json_data_provider.read_json_data() 
+
+    def collect_data(self):
+        self.json_data_provider.read_json_data()
     
     def get_value(self, key):
         return self.json_data_provider.get_value_from_json(key)
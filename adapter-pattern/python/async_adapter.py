@@ -0,0 +1,204 @@
+"""
+Async data providers
+
+collect_data in the adapter modules blocks the caller on file I/O and
+parsing. These async counterparts read the file and parse it in an executor,
+so the event loop keeps running while many providers load with gather.
+"""
+import asyncio
+import json
+import os
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from xml.etree import ElementTree
+
+
+class AsyncDataProviderInterface(ABC):
+    """
+    Async DataProvider Interface
+    Methods:
+        collect_data: coroutine to collect the data
+        get_value: to get the value from the collected data
+    """
+
+    def __init__(self):
+        self.data = None
+
+    @abstractmethod
+    async def collect_data(self):
+        pass
+
+    @abstractmethod
+    def get_value(self, key):
+        pass
+
+
+class AsyncJSONDataProviderInterface(ABC):
+
+    @abstractmethod
+    async def read_json_data(self):
+        pass
+
+    @abstractmethod
+    def get_value_from_json(self, key):
+        pass
+
+
+def read_bytes(path):
+    with open(path, "rb") as file:
+        return file.read()
+
+
+def parse_xml(raw):
+    # Leaf tag -> text, first occurrence wins like BeautifulSoup's find
+    values = {}
+    for elem in ElementTree.fromstring(raw).iter():
+        if len(elem) == 0:
+            values.setdefault(elem.tag.rsplit("}", 1)[-1], elem.text or "")
+    return values
+
+
+async def load(path, parser, executor=None):
+    loop = asyncio.get_running_loop()
+    raw = await loop.run_in_executor(None, read_bytes, path)
+    return await loop.run_in_executor(executor, parser, raw)
+
+
+class AsyncXMLDataProvider(AsyncDataProviderInterface):
+
+    def __init__(self, path="data.xml", executor=None):
+        self.path = path
+        self.executor = executor
+        self.data = None
+
+    async def collect_data(self):
+        self.data = await load(self.path, parse_xml, self.executor)
+
+    def get_value(self, key):
+        return self.data.get(key)
+
+
+class AsyncJSONDataProvider(AsyncJSONDataProviderInterface):
+
+    def __init__(self, path="data.json", executor=None):
+        self.path = path
+        self.executor = executor
+        self.data = None
+
+    async def read_json_data(self):
+        self.data = await load(self.path, json.loads, self.executor)
+
+    def get_value_from_json(self, key):
+        return self.data.get(key)
+
+
+class AsyncJSONtoXMLAdapter(AsyncDataProviderInterface):
+
+    def __init__(self, json_provider: AsyncJSONDataProviderInterface):
+        self.json_provider = json_provider
+
+    async def collect_data(self):
+        await self.json_provider.read_json_data()
+
+    def get_value(self, key):
+        return self.json_provider.get_value_from_json(key)
+
+
+class AsyncWeather():
+    def __init__(self, data_provider: AsyncDataProviderInterface):
+        self.data_provider = data_provider
+
+    @classmethod
+    async def create(cls, data_provider: AsyncDataProviderInterface):
+        await data_provider.collect_data()
+        return cls(data_provider)
+
+    def print_weather(self):
+        res = f"At {self.data_provider.get_value('time')} temperature is {self.data_provider.get_value('temp')} {self.data_provider.get_value('unit')}"
+        print(res)
+
+
+async def collect_all(providers):
+    return await asyncio.gather(*(AsyncWeather.create(provider) for provider in providers))
+
+
+class LoopLagMonitor:
+    """
+    Sleeps for interval in a loop and records how late each wake-up was
+    """
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.max_lag = 0.0
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.max_lag = max(self.max_lag, loop.time() - start - self.interval)
+
+    def __enter__(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def __exit__(self, *exc):
+        self._task.cancel()
+
+
+def blocking_load(path):
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+async def benchmark(files=50, readings=20_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(files):
+            path = os.path.join(tmp, f"feed{i}.json")
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump({
+                    "history": [{"temp": f"{n % 40}deg"} for n in range(readings)],
+                    "time": "10:00AM", "temp": "23deg", "unit": "celsius",
+                }, file)
+            paths.append(path)
+        print(f"{files} providers, {os.path.getsize(paths[0]) / 1024:.0f} KB each")
+
+        with LoopLagMonitor() as monitor:
+            await asyncio.sleep(0.01)
+            start = time.perf_counter()
+            for path in paths:
+                blocking_load(path)
+                await asyncio.sleep(0)
+            elapsed = time.perf_counter() - start
+        print(f"blocking collect_data  : total={elapsed:.3f}s max loop lag={monitor.max_lag * 1000:.1f}ms")
+
+        # Threads still share the GIL with the loop while parsing,
+        # a process pool moves the parsing off it entirely
+        with ProcessPoolExecutor() as process_pool:
+            for name, executor in (("thread pool", None), ("process pool", process_pool)):
+                with LoopLagMonitor() as monitor:
+                    await asyncio.sleep(0.01)
+                    start = time.perf_counter()
+                    await collect_all(
+                        AsyncJSONtoXMLAdapter(AsyncJSONDataProvider(path, executor)) for path in paths
+                    )
+                    elapsed = time.perf_counter() - start
+                print(f"async, {name:<14} : total={elapsed:.3f}s max loop lag={monitor.max_lag * 1000:.1f}ms")
+
+
+async def client_code():
+    weathers = await collect_all([
+        AsyncXMLDataProvider(),
+        AsyncJSONtoXMLAdapter(AsyncJSONDataProvider()),
+    ])
+    for weather in weathers:
+        weather.print_weather()
+
+
+if __name__ == '__main__':
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    asyncio.run(client_code())
+    asyncio.run(benchmark())
@@ -0,0 +1,155 @@
+"""
+Batch ingestion of weather feed directories
+
+Walks a directory of mixed XML / JSON feeds, picks the provider for each file
+by extension and parses chunks of files in a process pool. Records come back
+as a generator of (time, temp, unit) tuples, only a bounded number of chunks
+is in flight at any time so memory does not grow with the directory size.
+A feed that can't be read or parsed is logged and skipped, it does not stop
+the run.
+"""
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from json_lazy_provider import JSONDataProvider, JSONtoXMLAdapter
+from xml_streaming_provider import DataProviderInterface, StreamingXMLDataProvider
+
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+
+logger = logging.getLogger(__name__)
+
+
+def xml_provider(path) -> DataProviderInterface:
+    return StreamingXMLDataProvider(path)
+
+
+def json_provider(path) -> DataProviderInterface:
+    return JSONtoXMLAdapter(JSONDataProvider(path))
+
+
+PROVIDERS = {
+    ".xml": xml_provider,
+    ".json": json_provider,
+}
+
+
+def _text(value):
+    return "" if value is None else str(value)
+
+
+def normalize(time_value, temp, unit):
+    # "23deg" -> 23.0, 23 -> 23.0, "Celsius " -> "celsius"
+    match = _NUMBER.search(_text(temp))
+    return (
+        _text(time_value).strip(),
+        float(match.group()) if match else None,
+        _text(unit).strip().lower(),
+    )
+
+
+def read_record(path):
+    provider = PROVIDERS[os.path.splitext(path)[1].lower()](path)
+    provider.collect_data()
+    return normalize(
+        provider.get_value("time"),
+        provider.get_value("temp"),
+        provider.get_value("unit"),
+    )
+
+
+def read_chunk(paths):
+    # Returns the records and the (path, error) of every feed that failed
+    records, failures = [], []
+    for path in paths:
+        try:
+            records.append(read_record(path))
+        except Exception as exc:
+            failures.append((path, f"{type(exc).__name__}: {exc}"))
+    return records, failures
+
+
+def iter_feed_files(directory):
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file() and os.path.splitext(entry.name)[1].lower() in PROVIDERS:
+                yield entry.path
+
+
+def iter_chunks(paths, chunk_size):
+    chunk = []
+    for path in paths:
+        chunk.append(path)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def ingest(directory, workers=None, chunk_size=64, max_pending=None, failures=None):
+    """
+    Yield normalized (time, temp, unit) records for every feed in directory,
+    in directory order. Feeds that fail are logged and skipped, pass a list
+    as failures to also collect them as (path, error) pairs.
+    """
+    workers = workers or os.cpu_count()
+    max_pending = max_pending or workers * 2
+
+    def drain(future):
+        records, failed = future.result()
+        for path, error in failed:
+            logger.warning("Skipping feed %s: %s", path, error)
+        if failures is not None:
+            failures.extend(failed)
+        return records
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in iter_chunks(iter_feed_files(directory), chunk_size):
+            pending.append(pool.submit(read_chunk, chunk))
+            if len(pending) >= max_pending:
+                yield from drain(pending.popleft())
+        while pending:
+            yield from drain(pending.popleft())
+
+
+def generate_feeds(directory, count):
+    for i in range(count):
+        if i % 2:
+            with open(os.path.join(directory, f"feed{i}.json"), "w", encoding="utf-8") as file:
+                json.dump({"time": f"{i % 24}:00", "temp": f"{i % 40}deg", "unit": "celsius"}, file)
+        else:
+            with open(os.path.join(directory, f"feed{i}.xml"), "w", encoding="utf-8") as file:
+                file.write(
+                    f"<weather><time>{i % 24}:00</time><temp>{i % 40}deg</temp>"
+                    "<unit>Celsius</unit></weather>"
+                )
+
+
+def benchmark(files=4000):
+    with tempfile.TemporaryDirectory() as tmp:
+        generate_feeds(tmp, files)
+        print(f"{files} feed files")
+        print(f"{os.cpu_count()} CPUs")
+        for workers in (1, 2, 4, 8):
+            start = time.perf_counter()
+            count = sum(1 for _ in ingest(tmp, workers=workers))
+            elapsed = time.perf_counter() - start
+            print(f"workers={workers:<3} records={count} files/sec={count / elapsed:,.0f}")
+
+
+def client_code():
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for time_value, temp, unit in ingest(directory, workers=2):
+        print(f"At {time_value} temperature is {temp} {unit}")
+
+
+if __name__ == '__main__':
+    client_code()
+    benchmark()
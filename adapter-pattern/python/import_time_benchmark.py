@@ -0,0 +1,95 @@
+"""
+Import-time benchmark for the adapter entry points
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter for
+every entry point, several times, and reports the median cumulative import
+time of the module plus the heaviest modules it pulled in. Pass --max-ms to
+fail (exit code 1) when an entry point gets slower than that.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ENTRY_POINTS = [
+    "adapter",
+    "adapter_after",
+    "adapter_after_class",
+    "json_lazy_provider",
+    "xml_streaming_provider",
+    "parsed_data_cache",
+    "async_adapter",
+    "batch_ingestion",
+    "weather_columns",
+]
+
+# Imports that should only happen once an XML provider is used
+HEAVY_XML_MODULES = ("bs4", "lxml", "soupsieve")
+
+
+def import_times(module):
+    """
+    Return {imported module: (self us, cumulative us)} for one fresh import
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def measure(module, repeat):
+    # The total and the breakdown both come from the median run, so a child
+    # module is never shown slower than the module that imported it
+    runs = [import_times(module) for _ in range(repeat)]
+    total = statistics.median_low(run[module][1] for run in runs)
+    median_run = next(run for run in runs if run[module][1] == total)
+    heaviest = sorted(
+        ((name, cumulative) for name, (_, cumulative) in median_run.items() if name != module),
+        key=lambda item: item[1],
+        reverse=True,
+    )[:3]
+    xml_loaded = [name for name in median_run if name.split(".")[0] in HEAVY_XML_MODULES]
+    return total, heaviest, xml_loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    failed = []
+    for module in args.modules:
+        try:
+            total, heaviest, xml_loaded = measure(module, args.repeat)
+        except subprocess.CalledProcessError as exc:
+            print(f"{module:<24} import failed: {exc.stderr.strip().splitlines()[-1]}")
+            failed.append(module)
+            continue
+        slowest = ", ".join(f"{name} {cumulative / 1000:.1f}ms" for name, cumulative in heaviest)
+        print(
+            f"{module:<24} {total / 1000:6.1f} ms  xml deps loaded: "
+            f"{'yes' if xml_loaded else 'no ':<3}  heaviest: {slowest}"
+        )
+        if args.max_ms is not None and total / 1000 > args.max_ms:
+            failed.append(module)
+
+    if failed:
+        print(f"Over budget or failing: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,260 @@
+"""
+Lazy JSON data provider
+
+JSONDataProvider calls json.load on the whole file before the first lookup.
+LazyJSONDataProvider memory-maps the file and only decodes the values that
+are asked for. The top-level key -> (start, end) offsets are either
+indexed up front or discovered lazily as keys are asked for. JSONtoXMLAdapter works with it unchanged.
+"""
+import json
+import mmap
+import os
+import re
+import time
+from abc import ABC, abstractmethod
+
+_STRING = re.compile(rb'"(?:[^"\\]|\\.)*"', re.DOTALL)
+# Skips plain text and whole strings in one go, stops on the next bracket
+_NEXT_BRACKET = re.compile(rb'(?:[^"{}\[\]]+|"(?:[^"\\]|\\.)*")*([{\[])?', re.DOTALL)
+_SCALAR_END = re.compile(rb'[,}\]\s]')
+_WHITESPACE = re.compile(rb'\s*')
+
+
+def _skip_ws(buf, pos):
+    return _WHITESPACE.match(buf, pos).end()
+
+
+def _skip_string(buf, pos):
+    # pos is on the opening quote, returns the index after the closing one
+    match = _STRING.match(buf, pos)
+    if match is None:
+        raise ValueError("Unterminated string in JSON data")
+    return match.end()
+
+
+def _skip_value(buf, pos):
+    first = buf[pos:pos + 1]
+    if first == b'"':
+        return _skip_string(buf, pos)
+    if first in (b"{", b"["):
+        depth = 0
+        end = len(buf)
+        while pos < end:
+            match = _NEXT_BRACKET.match(buf, pos)
+            pos = match.end()
+            if match.group(1):
+                depth += 1
+            elif pos < end:
+                # The regex stopped on a closing bracket
+                depth -= 1
+                pos += 1
+                if depth == 0:
+                    return pos
+        raise ValueError("Unterminated object in JSON data")
+    match = _SCALAR_END.search(buf, pos)
+    return match.start() if match else len(buf)
+
+
+def iter_top_level(buf):
+    """
+    Yield (key, start, end) for every member of the top-level object
+    without decoding the values
+    """
+    pos = _skip_ws(buf, 0)
+    if buf[pos:pos + 1] != b"{":
+        raise ValueError("Top-level JSON value must be an object")
+    pos = _skip_ws(buf, pos + 1)
+    while buf[pos:pos + 1] != b"}":
+        key_end = _skip_string(buf, pos)
+        key = json.loads(buf[pos:key_end])
+        pos = _skip_ws(buf, key_end)
+        if buf[pos:pos + 1] != b":":
+            raise ValueError(f"Expected ':' after key {key!r}")
+        start = _skip_ws(buf, pos + 1)
+        end = _skip_value(buf, start)
+        yield key, start, end
+        pos = _skip_ws(buf, end)
+        if buf[pos:pos + 1] == b",":
+            pos = _skip_ws(buf, pos + 1)
+
+
+class DataProviderInterface(ABC):
+
+    def __init__(self):
+        self.data = None
+
+    @abstractmethod
+    def collect_data(self):
+        pass
+
+    @abstractmethod
+    def get_value(self, key):
+        pass
+
+
+class JSONDataProviderInterface(ABC):
+
+    @abstractmethod
+    def read_json_data(self):
+        pass
+
+    @abstractmethod
+    def get_value_from_json(self):
+        pass
+
+
+class JSONDataProvider(JSONDataProviderInterface):
+
+    def __init__(self, path="data.json"):
+        self.path = path
+        self.data = None
+
+    def read_json_data(self):
+        with open(self.path, encoding="utf-8") as file:
+            data = json.load(file)
+        self.data = data
+
+    def get_value_from_json(self, key):
+        return self.data.get(key)
+
+
+class LazyJSONDataProvider(JSONDataProviderInterface):
+    """
+    use_index=True: scan the whole top-level object once in read_json_data
+    use_index=False: scan only as far as the requested key, offsets seen on
+    the way are remembered so later lookups resume instead of rescanning
+
+    With a duplicated key the full index keeps the last value, like
+    json.load. A lazy lookup stops at the first one it meets: finding the
+    last would mean scanning to the end of the object every time.
+    """
+
+    def __init__(self, path="data.json", use_index=True):
+        self.path = path
+        self.use_index = use_index
+        self.data = None
+        self.index = {}
+        self._scanner = None
+        self._values = {}
+
+    def read_json_data(self):
+        self.close()
+        with open(self.path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                # mmap refuses empty files, report it the way json.load does
+                raise json.JSONDecodeError("Expecting value", "", 0)
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.index = {}
+        self._values = {}
+        self._scanner = iter_top_level(self.data)
+        if self.use_index:
+            self._scan_until(None)
+
+    def _scan_until(self, key):
+        for found, start, end in self._scanner:
+            self.index[found] = (start, end)
+            if found == key:
+                break
+
+    def get_value_from_json(self, key):
+        if key not in self._values:
+            if key not in self.index:
+                self._scan_until(key)
+            span = self.index.get(key)
+            if span is None:
+                return None
+            start, end = span
+            self._values[key] = json.loads(self.data[start:end])
+        return self._values[key]
+
+    def close(self):
+        if self.data is not None:
+            self._scanner = None
+            self.data.close()
+            self.data = None
+
+
+class JSONtoXMLAdapter(DataProviderInterface):
+
+    def __init__(self, json_provider: JSONDataProviderInterface):
+        self.json_provider = json_provider
+
+    def collect_data(self):
+        self.json_provider.read_json_data()
+
+    def get_value(self, key):
+        return self.json_provider.get_value_from_json(key)
+
+
+class Weather():
+    def __init__(self, data_provider: DataProviderInterface):
+        self.data_provider = data_provider
+        self.data_provider.collect_data()
+
+    def print_weather(self):
+        res = f"At {self.data_provider.get_value('time')} temperature is {self.data_provider.get_value('temp')} {self.data_provider.get_value('unit')}"
+        print(res)
+
+
+def generate_feed(path, readings):
+    # A big "history" member in front of the three keys Weather asks for
+    with open(path, "w", encoding="utf-8") as file:
+        file.write('{\n    "history": [\n')
+        for i in range(readings):
+            sep = "," if i < readings - 1 else ""
+            file.write(f'        {{"time": "{i % 24}:00", "temp": "{i % 40}deg", "note": "a \\"quoted\\" {{x}}"}}{sep}\n')
+        file.write('    ],\n    "time": "10:00AM",\n    "temp": "23deg",\n    "unit": "celsius"\n}\n')
+
+
+def read_weather(provider):
+    weather_provider = JSONtoXMLAdapter(provider)
+    weather_provider.collect_data()
+    values = [weather_provider.get_value(key) for key in ("time", "temp", "unit")]
+    if isinstance(provider, LazyJSONDataProvider):
+        provider.close()
+    return values
+
+
+def measure(provider):
+    import tracemalloc
+
+    start = time.perf_counter()
+    values = read_weather(provider)
+    elapsed = time.perf_counter() - start
+
+    # Separate run, tracemalloc slows everything down
+    tracemalloc.start()
+    read_weather(provider)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, values
+
+
+def benchmark(readings=200_000):
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "feed.json")
+        generate_feed(path, readings)
+        size = os.path.getsize(path) / 1024 / 1024
+        print(f"\n{readings} readings ({size:.1f} MB)")
+        for name, provider in (
+            ("json.load", JSONDataProvider(path)),
+            ("mmap + index", LazyJSONDataProvider(path, use_index=True)),
+            ("mmap + scan", LazyJSONDataProvider(path, use_index=False)),
+        ):
+            elapsed, peak, values = measure(provider)
+            print(f"{name:<14} time={elapsed:.3f}s peak={peak / 1024 / 1024:.1f}MB values={values}")
+
+
+def client_code():
+    json_provider = LazyJSONDataProvider()
+    xml_json_adapter = JSONtoXMLAdapter(json_provider)
+    weather = Weather(data_provider=xml_json_adapter)
+    weather.print_weather()
+    json_provider.close()
+
+
+if __name__ == '__main__':
+    client_code()
+    benchmark()
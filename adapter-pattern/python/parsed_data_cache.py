@@ -0,0 +1,133 @@
+"""
+Shared cache of parsed provider data
+
+Every Weather(...) calls collect_data(), which re-opens and re-parses the data
+file. ParsedDataCache keeps the parsed result per file, keyed by
+(path, mtime, size), so the file is parsed again only when it changes.
+It is safe to share between threads and keeps at most max_entries files.
+
+Every caller gets the same parsed object, so it must never be modified:
+a change would show up in every provider that loads the file afterwards.
+Parsers should return read-only data, as the JSON ones do with a
+MappingProxyType. A BeautifulSoup tree can't be made read-only and is
+only to be read.
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+
+
+class ParsedDataCache:
+    """
+    LRU of path -> ((mtime, size), parsed data)
+    Methods:
+        load: return the shared, read-only parsed data for path, parsing it
+            with parser on a miss
+        invalidate: forget one path or everything
+        stats: hits, misses and hit rate
+    """
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._path_locks = {}
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, path, parser):
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[1]
+            # [lock, threads using it], dropped when the last one is done so
+            # the dict only holds paths that are being parsed right now
+            path_lock = self._path_locks.setdefault(path, [threading.Lock(), 0])
+            path_lock[1] += 1
+
+        try:
+            # One thread parses a given file, the others wait for its result
+            with path_lock[0]:
+                with self._lock:
+                    entry = self._entries.get(path)
+                    if entry is not None and entry[0] == stamp:
+                        self._entries.move_to_end(path)
+                        self.hits += 1
+                        return entry[1]
+                    self.misses += 1
+                data = parser(path)
+                with self._lock:
+                    self._entries[path] = (stamp, data)
+                    self._entries.move_to_end(path)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                return data
+        finally:
+            with self._lock:
+                path_lock[1] -= 1
+                if not path_lock[1]:
+                    del self._path_locks[path]
+
+    def invalidate(self, path=None):
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(path), None)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+# Shared by every provider in the adapter modules
+parsed_data_cache = ParsedDataCache()
+
+
+def parse_json(path):
+    with open(path, encoding="utf-8") as file:
+        return MappingProxyType(json.load(file))
+
+
+def benchmark(objects=20_000, threads=8):
+    from concurrent.futures import ThreadPoolExecutor
+
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data.json")
+
+    start = time.perf_counter()
+    for _ in range(objects):
+        parse_json(path)
+    uncached = time.perf_counter() - start
+
+    cache = ParsedDataCache()
+    start = time.perf_counter()
+    for _ in range(objects):
+        cache.load(path, parse_json)
+    cached = time.perf_counter() - start
+
+    threaded_cache = ParsedDataCache()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda _: threaded_cache.load(path, parse_json), range(objects)))
+
+    print(f"parse every time : {objects / uncached:,.0f} loads/sec")
+    print(f"shared cache     : {objects / cached:,.0f} loads/sec")
+    print(f"{threads} threads        : {threaded_cache.stats()}")
+
+
+if __name__ == '__main__':
+    benchmark()
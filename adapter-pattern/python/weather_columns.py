@@ -0,0 +1,234 @@
+"""
+Columnar weather record store
+
+Weather.print_weather reads one provider at a time and temperatures stay
+strings like "23deg". WeatherColumns reads any DataProviderInterface once,
+parses time and temperature into typed arrays (minutes since midnight and
+degrees celsius) and answers aggregates over the whole column at once.
+"""
+import random
+import re
+import time
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left
+from statistics import fmean
+
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+_TIME = re.compile(r"(\d{1,2}):(\d{2})\s*([AaPp][Mm])?")
+
+# unit -> function converting a reading in that unit to celsius
+TO_CELSIUS = {
+    "celsius": lambda value: value,
+    "fahrenheit": lambda value: (value - 32) * 5 / 9,
+    "kelvin": lambda value: value - 273.15,
+}
+UNIT_ALIASES = {"c": "celsius", "f": "fahrenheit", "k": "kelvin"}
+
+
+class DataProviderInterface(ABC):
+
+    def __init__(self):
+        self.data = None
+
+    @abstractmethod
+    def collect_data(self):
+        pass
+
+    @abstractmethod
+    def get_value(self, key):
+        pass
+
+
+class DictDataProvider(DataProviderInterface):
+    """
+    In-memory provider, stands in for XML / JSON feeds in the benchmark
+    """
+    def __init__(self, values):
+        self.values = values
+        self.data = None
+
+    def collect_data(self):
+        self.data = self.values
+
+    def get_value(self, key):
+        return self.data.get(key)
+
+
+def parse_minutes(value):
+    # "10:00AM" / "22:15" -> minutes since midnight
+    match = _TIME.match(value.strip())
+    if match is None:
+        raise ValueError(f"Invalid time {value!r}")
+    hours, minutes, meridiem = int(match.group(1)), int(match.group(2)), match.group(3)
+    if meridiem:
+        hours = hours % 12 + (12 if meridiem.lower() == "pm" else 0)
+    return hours * 60 + minutes
+
+
+def parse_celsius(temp, unit):
+    # temp is a number, as JSON feeds give it, or a string like "23deg"
+    if isinstance(temp, (int, float)):
+        value = float(temp)
+    else:
+        match = _NUMBER.search(str(temp))
+        if match is None:
+            raise ValueError(f"Invalid temperature {temp!r}")
+        value = float(match.group())
+    name = str(unit).strip().lower().lstrip("°")
+    convert = TO_CELSIUS.get(UNIT_ALIASES.get(name, name))
+    if convert is None:
+        raise ValueError(f"Unknown temperature unit {unit!r}")
+    return convert(value)
+
+
+class WeatherColumns:
+    """
+    Struct of arrays: minutes[i] and celsius[i] belong to the same reading.
+    Aggregates over an empty store raise ValueError.
+    """
+    def __init__(self):
+        self.minutes = array("H")
+        self.celsius = array("d")
+        self._sorted = None
+        self._by_minute = None
+
+    def __len__(self):
+        return len(self.celsius)
+
+    def add(self, provider: DataProviderInterface):
+        # Parse both before appending either, a bad reading leaves no half row
+        minute = parse_minutes(provider.get_value("time"))
+        celsius = parse_celsius(provider.get_value("temp"), provider.get_value("unit"))
+        self.minutes.append(minute)
+        self.celsius.append(celsius)
+        self._sorted = None
+        self._by_minute = None
+
+    def extend(self, providers):
+        for provider in providers:
+            self.add(provider)
+
+    def _column(self):
+        if not self.celsius:
+            raise ValueError("No readings")
+        return self.celsius
+
+    def _sorted_column(self):
+        # Kept until the next add
+        if self._sorted is None:
+            self._sorted = array("d", sorted(self.celsius))
+        return self._sorted
+
+    def min(self):
+        return min(self._column())
+
+    def max(self):
+        return max(self._column())
+
+    def mean(self):
+        return fmean(self._column())
+
+    def percentile(self, p):
+        # Nearest-rank percentile
+        self._column()
+        column = self._sorted_column()
+        rank = max(0, min(len(column) - 1, round(p / 100 * len(column)) - 1))
+        return column[rank]
+
+    def count_below(self, celsius):
+        return bisect_left(self._sorted_column(), celsius)
+
+    def buckets(self, minutes=60):
+        """
+        Return {bucket start minute: (count, mean, min, max)}. Both columns
+        are sorted by minute once, each bucket is then one slice found by
+        bisect and aggregated by min / max / fmean over the whole slice.
+        """
+        if self._by_minute is None:
+            order = sorted(range(len(self.minutes)), key=self.minutes.__getitem__)
+            self._by_minute = (
+                array("H", map(self.minutes.__getitem__, order)),
+                array("d", map(self.celsius.__getitem__, order)),
+            )
+        by_minute, celsius = self._by_minute
+        result = {}
+        if not by_minute:
+            return result
+        low = 0
+        for start in range(by_minute[0] - by_minute[0] % minutes, by_minute[-1] + 1, minutes):
+            high = bisect_left(by_minute, start + minutes, low)
+            if high > low:
+                values = celsius[low:high]
+                result[start] = (len(values), fmean(values), min(values), max(values))
+            low = high
+        return result
+
+
+def loop_over_providers(providers):
+    # What we do today: string lookups and parsing on every pass
+    total, low, high = 0.0, None, None
+    for provider in providers:
+        value = parse_celsius(provider.get_value("temp"), provider.get_value("unit"))
+        total += value
+        low = value if low is None or value < low else low
+        high = value if high is None or value > high else high
+    return low, high, total / len(providers)
+
+
+def benchmark(readings=500_000, passes=5):
+    from_celsius = {
+        "celsius": lambda value: value,
+        "fahrenheit": lambda value: value * 9 / 5 + 32,
+        "kelvin": lambda value: value + 273.15,
+    }
+    providers = []
+    for i in range(readings):
+        unit = random.choice(list(from_celsius))
+        temp = from_celsius[unit](random.uniform(-10, 40))
+        providers.append(DictDataProvider({
+            "time": f"{i % 24}:{i % 60:02d}",
+            "temp": f"{temp:.1f}deg",
+            "unit": unit,
+        }))
+        providers[-1].collect_data()
+
+    start = time.perf_counter()
+    for _ in range(passes):
+        loop_over_providers(providers)
+    looped = (time.perf_counter() - start) / passes
+
+    start = time.perf_counter()
+    columns = WeatherColumns()
+    columns.extend(providers)
+    load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(passes):
+        columns.min(), columns.max(), columns.mean()
+    columnar = (time.perf_counter() - start) / passes
+
+    print(f"{readings} readings")
+    print(f"loop over providers : {looped * 1000:.1f} ms per min/max/mean pass")
+    print(f"columnar            : {columnar * 1000:.1f} ms per pass (+{load * 1000:.0f} ms one-off load)")
+    print(f"p50={columns.percentile(50):.1f} p95={columns.percentile(95):.1f} p99={columns.percentile(99):.1f}")
+    for start_minute, (count, mean, low, high) in columns.buckets(360).items():
+        print(f"  {start_minute // 60:02d}:00 count={count} mean={mean:.1f} min={low:.1f} max={high:.1f}")
+
+
+def client_code():
+    providers = [
+        DictDataProvider({"time": "10:00AM", "temp": "23deg", "unit": "celsius"}),
+        DictDataProvider({"time": "10:30AM", "temp": "70deg", "unit": "fahrenheit"}),
+        DictDataProvider({"time": "2:00PM", "temp": "300deg", "unit": "kelvin"}),
+    ]
+    for provider in providers:
+        provider.collect_data()
+    columns = WeatherColumns()
+    columns.extend(providers)
+    print(f"min={columns.min():.1f} max={columns.max():.1f} mean={columns.mean():.1f}")
+
+
+if __name__ == '__main__':
+    client_code()
+    benchmark()
@@ -0,0 +1,169 @@
+"""
+Streaming XML data provider
+
+XMLDataProvider reads the whole file and keeps a BeautifulSoup tree around,
+every get_value is a tree search. StreamingXMLDataProvider walks the file with
+iterparse, drops every element once it is read and keeps a flat
+key -> value index, so get_value is a dict lookup.
+"""
+import os
+import time
+from abc import ABC, abstractmethod
+from xml.etree.ElementTree import iterparse
+
+
+class DataProviderInterface(ABC):
+    """
+    DataProvider Interface
+    Methods:
+        collect_data: to collect the data
+        get_value: to get the value from data
+    """
+
+    def __init__(self):
+        self.data = None
+
+    @abstractmethod
+    def collect_data(self):
+        """
+        Method to collect the data
+        """
+        pass
+
+    @abstractmethod
+    def get_value(self, key):
+        """
+        Method to get value from data
+        """
+        pass
+
+
+class XMLDataProvider(DataProviderInterface):
+    """
+    DataProvider: XML Data Provider (BeautifulSoup tree)
+    """
+    def __init__(self, path="data.xml"):
+        self.path = path
+        self.data = None
+
+    def collect_data(self):
+        from bs4 import BeautifulSoup
+
+        with open(self.path, encoding="utf-8") as file:
+            data = file.read()
+        self.data = BeautifulSoup(data, "xml")
+
+    def get_value(self, key):
+        value = self.data.find(key)
+        return value.text if value else value
+
+
+class StreamingXMLDataProvider(DataProviderInterface):
+    """
+    DataProvider: XML Data Provider built on iterparse
+
+    Only leaf elements are indexed. Like BeautifulSoup's find, the first
+    element with a given tag name wins, namespaces are ignored.
+    """
+    def __init__(self, path="data.xml"):
+        self.path = path
+        self.data = None
+
+    def collect_data(self):
+        index = {}
+        # stack of [element, has_children] for the elements currently open
+        stack = []
+        for event, elem in iterparse(self.path, events=("start", "end")):
+            if event == "start":
+                if stack:
+                    stack[-1][1] = True
+                stack.append([elem, False])
+                continue
+
+            _, has_children = stack.pop()
+            if not has_children:
+                key = elem.tag.rsplit("}", 1)[-1]
+                if key not in index:
+                    index[key] = elem.text or ""
+            elem.clear()
+            # The finished element is always the last child of its parent
+            if stack:
+                del stack[-1][0][-1]
+        self.data = index
+
+    def get_value(self, key):
+        return self.data.get(key)
+
+
+class Weather():
+    def __init__(self, data_provider: DataProviderInterface):
+        self.data_provider = data_provider
+        self.data_provider.collect_data()
+
+    def print_weather(self):
+        res = f"At {self.data_provider.get_value('time')} temperature is {self.data_provider.get_value('temp')} {self.data_provider.get_value('unit')}"
+        print(res)
+
+
+def generate_feed(path, readings):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("<feed>\n")
+        file.write("    <weather><time>10:00AM</time><temp>21deg</temp><unit>celsius</unit></weather>\n")
+        for i in range(readings):
+            file.write(
+                f"    <reading><station>st{i}</station><time>{i % 24}:00</time>"
+                f"<temp>{i % 40}deg</temp><unit>celsius</unit></reading>\n"
+            )
+        file.write("</feed>\n")
+
+
+def measure(provider):
+    import tracemalloc
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    provider.collect_data()
+    parse_time = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        provider.get_value("unit")
+    lookup_time = (time.perf_counter() - start) / 1000
+    return parse_time, peak, lookup_time
+
+
+def benchmark(readings=(10_000, 100_000)):
+    import tempfile
+
+    for count in readings:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "feed.xml")
+            generate_feed(path, count)
+            size = os.path.getsize(path) / 1024 / 1024
+            print(f"\n{count} readings ({size:.1f} MB)")
+
+            providers = [StreamingXMLDataProvider(path)]
+            try:
+                import bs4  # noqa: F401
+                providers.append(XMLDataProvider(path))
+            except ImportError:
+                print("bs4 not installed, skipping BeautifulSoup provider")
+
+            for provider in providers:
+                parse_time, peak, lookup_time = measure(provider)
+                print(
+                    f"{type(provider).__name__:<26} parse={parse_time:.3f}s "
+                    f"peak={peak / 1024 / 1024:.1f}MB get_value={lookup_time * 1e6:.2f}us"
+                )
+
+
+def client_code():
+    weather = Weather(data_provider=StreamingXMLDataProvider())
+    weather.print_weather()
+
+
+if __name__ == '__main__':
+    client_code()
+    benchmark()
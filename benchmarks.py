@@ -0,0 +1,219 @@
+"""
+Runs every naive / pattern pair of scripts in the repo and compares what
+the pattern costs or saves: wall time, peak traced memory, allocated
+blocks left behind and max RSS. Each script runs in its own interpreter
+with stdout discarded, so infinite demo loops, missing dependencies and
+scripts that don't compile show up as a status instead of stopping the run.
+
+    python benchmarks.py                 # compare with the saved baseline
+    python benchmarks.py --save          # write a new baseline
+    python benchmarks.py -k facade       # only pairs whose path contains "facade"
+"""
+import argparse
+import difflib
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+DEFAULT_BASELINE = ROOT / "benchmark_baseline.json"
+SKIP_DIRS = {".git", "__pycache__", ".venv", "venv", "node_modules"}
+
+# naive stem -> candidate stems of the pattern version, in the same directory
+PAIR_RULES = (
+    (re.compile(r"non_(?P<rest>.+)"), "{rest}"),
+    (re.compile(r"without_(?P<rest>.+)"), "with_{rest}"),
+    (re.compile(r"(?P<rest>.+)_wo"), "{rest}_w"),
+)
+WITH_SUFFIX = re.compile(r"(?P<rest>.+)_with_.+")
+
+METRICS = ("seconds", "peak_bytes", "blocks", "max_rss_kb")
+# Growth below these absolute amounts is noise for scripts this small
+NOISE_FLOOR = {"seconds": 0.05, "peak_bytes": 64 * 1024, "blocks": 1000, "max_rss_kb": 1024}
+
+# Runs inside the child interpreter: argv is script, mode, budget seconds
+HARNESS = r"""
+import json, os, resource, runpy, signal, sys, time
+
+path, mode, budget = sys.argv[1], sys.argv[2], float(sys.argv[3])
+result = {"status": "ok", "error": None}
+
+class BudgetExceeded(BaseException):
+    pass
+
+def stop(signum, frame):
+    raise BudgetExceeded()
+
+if hasattr(signal, "SIGALRM"):
+    signal.signal(signal.SIGALRM, stop)
+    signal.setitimer(signal.ITIMER_REAL, budget)
+
+out = sys.stdout
+sys.stdout = open(os.devnull, "w")
+sys.path[0] = os.path.dirname(path)
+os.chdir(os.path.dirname(path))
+if mode == "memory":
+    import tracemalloc
+    tracemalloc.start()
+blocks = sys.getallocatedblocks()
+start = time.perf_counter()
+try:
+    runpy.run_path(path, run_name="__main__")
+except BudgetExceeded:
+    result["status"] = "budget"
+except SystemExit as exc:
+    if exc.code not in (None, 0):
+        result["status"], result["error"] = "error", f"SystemExit({exc.code!r})"
+except BaseException as exc:
+    result["status"], result["error"] = "error", f"{type(exc).__name__}: {exc}"
+result["seconds"] = time.perf_counter() - start
+if hasattr(signal, "SIGALRM"):
+    signal.setitimer(signal.ITIMER_REAL, 0)
+if mode == "memory":
+    result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    result["blocks"] = sys.getallocatedblocks() - blocks
+    result["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+sys.stdout = out
+print(json.dumps(result))
+sys.stdout.flush()
+os._exit(0)
+"""
+
+
+def discover(root=ROOT):
+    """
+    Finds (naive, pattern) script pairs sharing a directory, by name:
+    non_X / X, without_X / with_X, X_wo / X_w and X / X_with_Y. A pattern
+    name that is off by a typo (notify_wo / notfity_w) is matched with
+    difflib against the scripts next to it.
+    """
+    pairs = []
+    for directory, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+        stems = sorted(name[:-3] for name in files if name.endswith(".py"))
+        for stem in stems:
+            pattern = None
+            match = WITH_SUFFIX.fullmatch(stem)
+            if match and match.group("rest") in stems:
+                stem, pattern = match.group("rest"), stem
+            for rule, template in PAIR_RULES:
+                match = rule.fullmatch(stem)
+                if pattern is None and match:
+                    wanted = template.format(**match.groupdict())
+                    found = difflib.get_close_matches(wanted, [other for other in stems if other != stem], 1, 0.8)
+                    pattern = found[0] if found else None
+            if pattern is not None:
+                pairs.append((Path(directory) / f"{stem}.py", Path(directory) / f"{pattern}.py"))
+    return sorted(pairs)
+
+
+def run_script(path, mode, budget, timeout):
+    try:
+        completed = subprocess.run(
+            [sys.executable, "-c", HARNESS, str(path), mode, str(budget)],
+            capture_output=True, text=True, timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return {"status": "timeout", "error": f"killed after {timeout}s"}
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        error = completed.stderr.strip().splitlines()
+        return {"status": "error", "error": error[-1] if error else f"exit code {completed.returncode}"}
+    return json.loads(lines[-1])
+
+
+def measure(path, repeat, budget, timeout):
+    # Timing runs without tracemalloc, which would slow them down a lot,
+    # then one extra run for the memory numbers
+    runs = [run_script(path, "time", budget, timeout) for _ in range(repeat)]
+    result = min(runs, key=lambda run: run.get("seconds", float("inf")))
+    if result["status"] in ("ok", "budget"):
+        memory = run_script(path, "memory", budget, timeout)
+        for metric in METRICS[1:]:
+            result[metric] = memory.get(metric)
+    return result
+
+
+def compare(current, baseline, threshold):
+    regressions = []
+    for key, result in current.items():
+        before = baseline.get(key)
+        if not before:
+            continue
+        if before["status"] == "ok" and result["status"] != "ok":
+            regressions.append(f"{key}: was ok, now {result['status']} ({result['error']})")
+            continue
+        if result["status"] != "ok" or before["status"] != "ok":
+            continue
+        for metric in METRICS:
+            old, new = before.get(metric), result.get(metric)
+            if old and new is not None and new > old * (1 + threshold) and new - old > NOISE_FLOOR[metric]:
+                regressions.append(f"{key}: {metric} {old:,.4g} -> {new:,.4g} (+{new / old - 1:.0%})")
+    return regressions
+
+
+def format_result(result):
+    if result["status"] not in ("ok", "budget") or result.get("peak_bytes") is None:
+        return f"{result['status']:<8} {result.get('error') or ''}"[:70]
+    # "budget": stopped while still running, numbers cover the budget only
+    return (f"{'stopped ' if result['status'] == 'budget' else ''}{result['seconds']:8.3f}s  peak {result['peak_bytes'] / 1e6:8.2f}MB  "
+            f"blocks {result['blocks']:>9,}  rss {result['max_rss_kb'] / 1024:7.1f}MB")
+
+
+def ratio(naive, pattern, metric):
+    if naive["status"] != "ok" or pattern["status"] != "ok" or not naive.get(metric):
+        return "   n/a"
+    return f"{pattern[metric] / naive[metric]:5.2f}x"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark naive vs pattern scripts")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="overwrite the baseline with this run")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed growth per metric, 0.25 = 25%%")
+    parser.add_argument("--repeat", type=int, default=3, help="timing runs per script, the fastest counts")
+    parser.add_argument("--budget", type=float, default=5.0, help="seconds before a script is stopped")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds before a script is killed")
+    parser.add_argument("-k", dest="keyword", default="", help="only pairs whose path contains this")
+    args = parser.parse_args(argv)
+
+    # Relative paths, so the checkout's own location never matches
+    pairs = [pair for pair in discover() if any(args.keyword in str(path.relative_to(ROOT)) for path in pair)]
+    if not pairs:
+        print("No script pairs found")
+        return 1
+
+    current = {}
+    for naive, pattern in pairs:
+        print(f"{naive.parent.relative_to(ROOT)}: {naive.name} vs {pattern.name}")
+        results = []
+        for path in (naive, pattern):
+            result = measure(path, args.repeat, args.budget, args.timeout)
+            current[str(path.relative_to(ROOT))] = result
+            results.append(result)
+            print(f"  {path.name:<24} {format_result(result)}")
+        print("  pattern / naive          "
+              + "  ".join(f"{metric} {ratio(*results, metric)}" for metric in ("seconds", "peak_bytes")))
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else None
+    if baseline is None or args.save:
+        args.baseline.write_text(json.dumps(current, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    regressions = compare(current, baseline, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for regression in regressions:
+            print("  " + regression)
+        return 1
+    print(f"No regressions beyond {args.threshold:.0%} against {args.baseline.name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
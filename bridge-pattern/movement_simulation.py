@@ -0,0 +1,214 @@
+import math
+import random
+import time
+from abc import ABC, abstractmethod
+from array import array
+from itertools import repeat
+from operator import add, mul
+
+
+# Implementation - Move
+# move() is the per-object API from app.py, advance() moves a whole group
+class Move(ABC):
+    speed = 1.0
+
+    @abstractmethod
+    def move(self):
+        pass
+
+    def step(self, animal, dt):
+        animal.x += animal.vx * dt
+        animal.y += animal.vy * dt
+
+    def advance(self, group, dt):
+        # One pass over the whole column instead of one call per agent
+        if dt != group.dt:
+            group.dx = array("d", map(mul, group.vx, repeat(dt)))
+            group.dy = array("d", map(mul, group.vy, repeat(dt)))
+            group.dt = dt
+        group.x = array("d", map(add, group.x, group.dx))
+        group.y = array("d", map(add, group.y, group.dy))
+
+
+# Concrete Implementation
+class Walk(Move):
+    speed = 1.4
+
+    def move(self):
+        print("Movement is walking")
+
+
+# Concrete Implementation
+class Fly(Move):
+    speed = 10.0
+
+    def move(self):
+        print("Movement is flying")
+
+
+# Concrete Implementation
+class Swim(Move):
+    speed = 2.0
+
+    def move(self):
+        print("Movement is Swiming")
+
+
+# Abstraction
+class Animals(ABC):
+    def __init__(self, move_logic: Move):
+        self.move_logic = move_logic
+        self.x = self.y = 0.0
+        self.vx = self.vy = 0.0
+
+    @abstractmethod
+    def move(self):
+        pass
+
+    def step(self, dt):
+        self.move_logic.step(self, dt)
+
+
+# Concrete Abstraction
+class Person(Animals):
+    def move(self):
+        self.move_logic.move()
+
+
+# Concrete Abstraction
+class Bird(Animals):
+    def move(self):
+        self.move_logic.move()
+
+
+# Concrete Abstraction
+class Fish(Animals):
+    def move(self):
+        self.move_logic.move()
+
+
+class MovementGroup:
+    """
+    Struct of arrays for every agent using one Move implementation,
+    row i of each column belongs to agents[i]
+    """
+    def __init__(self, move_logic):
+        self.move_logic = move_logic
+        self.agents = []
+        self.x, self.y = array("d"), array("d")
+        self.vx, self.vy = array("d"), array("d")
+        self.dx, self.dy = array("d"), array("d")
+        self.dt = None
+
+    def append(self, animal, x, y, vx, vy):
+        self.agents.append(animal)
+        self.x.append(x)
+        self.y.append(y)
+        self.vx.append(vx)
+        self.vy.append(vy)
+        self.dt = None
+
+    def remove(self, row):
+        # Swap with the last row so removal is O(1), returns the agent moved
+        # into row (or None) and the removed values
+        values = (self.x[row], self.y[row], self.vx[row], self.vy[row])
+        last = len(self.agents) - 1
+        for column in (self.agents, self.x, self.y, self.vx, self.vy):
+            column[row] = column[last]
+            column.pop()
+        self.dt = None
+        return (self.agents[row] if row < last else None), values
+
+
+class Simulation:
+    def __init__(self):
+        self.groups = {}
+        self.rows = {}  # animal -> (group, row)
+        self.ticks = 0
+
+    def _group(self, move_logic):
+        key = type(move_logic)
+        if key not in self.groups:
+            self.groups[key] = MovementGroup(move_logic)
+        return self.groups[key]
+
+    def add(self, animal, x=0.0, y=0.0, heading=None):
+        heading = random.uniform(0, 2 * math.pi) if heading is None else heading
+        speed = animal.move_logic.speed
+        group = self._group(animal.move_logic)
+        self.rows[animal] = (group, len(group.agents))
+        group.append(animal, x, y, speed * math.cos(heading), speed * math.sin(heading))
+
+    def switch(self, animal, move_logic):
+        # The bridge lets an animal change how it moves, the simulation only
+        # moves one row from one group to another
+        group, row = self.rows[animal]
+        moved, (x, y, vx, vy) = group.remove(row)
+        if moved is not None:
+            self.rows[moved] = (group, row)
+        scale = move_logic.speed / animal.move_logic.speed
+        animal.move_logic = move_logic
+        target = self._group(move_logic)
+        self.rows[animal] = (target, len(target.agents))
+        target.append(animal, x, y, vx * scale, vy * scale)
+
+    def tick(self, dt=1.0):
+        for group in self.groups.values():
+            group.move_logic.advance(group, dt)
+        self.ticks += 1
+
+    def position(self, animal):
+        group, row = self.rows[animal]
+        return group.x[row], group.y[row]
+
+
+def benchmark(agents=300_000, ticks=20):
+    kinds = ((Person, Walk), (Bird, Fly), (Fish, Swim))
+    population = [kind(move()) for kind, move in (kinds[i % 3] for i in range(agents))]
+
+    for animal in population:
+        heading = random.uniform(0, 2 * math.pi)
+        animal.vx = animal.move_logic.speed * math.cos(heading)
+        animal.vy = animal.move_logic.speed * math.sin(heading)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for animal in population:
+            animal.step(1.0)
+    per_object = ticks / (time.perf_counter() - start)
+
+    simulation = Simulation()
+    for animal in population:
+        simulation.add(animal)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        simulation.tick(1.0)
+    grouped = ticks / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for animal in population[:10_000]:
+        simulation.switch(animal, Swim() if isinstance(animal.move_logic, Walk) else Walk())
+    switch_cost = (time.perf_counter() - start) / 10_000
+
+    print(f"{agents:,} agents")
+    print(f"per-object dispatch : {per_object:8.1f} ticks/sec")
+    print(f"grouped columns     : {grouped:8.1f} ticks/sec")
+    print(f"switch move_logic   : {switch_cost * 1e6:8.2f} us per agent")
+
+
+def client_code():
+    gold_fish = Fish(move_logic=Swim())
+    gold_fish.move()
+
+    simulation = Simulation()
+    simulation.add(gold_fish, heading=0.0)
+    simulation.tick()
+    print("gold fish at", simulation.position(gold_fish))
+    # Flying fish: same object, different implementation behind the bridge
+    simulation.switch(gold_fish, Fly())
+    simulation.tick()
+    gold_fish.move()
+    print("gold fish at", simulation.position(gold_fish))
+
+
+client_code()
+benchmark()
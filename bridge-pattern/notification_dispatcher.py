@@ -0,0 +1,236 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+
+# IMPLEMENTATION SIDE
+# HOW messages are sent, now over the network and in bulk
+
+
+def escape_line(text):
+    return text.replace("\\", "\\\\").replace("\r", "\\r").replace("\n", "\\n")
+
+
+class MessageSender(ABC):
+    def __init__(self, host, port, max_connections=4):
+        self.host = host
+        self.port = port
+        self._limit = asyncio.Semaphore(max_connections)
+        self._idle = []
+
+    @property
+    @abstractmethod
+    def channel(self):
+        pass
+
+    @abstractmethod
+    def format(self, recipient, message):
+        pass
+
+    async def send(self, recipient, message):
+        await self.send_many([(recipient, message)])
+
+    async def send_many(self, deliveries):
+        # One write and one round trip for the whole batch. The protocol is
+        # one line per message, so line breaks inside a message are escaped
+        payload = "".join(
+            escape_line(self.format(recipient, message)) + "\n" for recipient, message in deliveries
+        ).encode()
+        async with self._limit:
+            reader, writer = self._idle.pop() if self._idle else await asyncio.open_connection(self.host, self.port)
+            try:
+                writer.write(payload)
+                await writer.drain()
+                for _ in deliveries:
+                    reply = await reader.readline()
+                    if not reply:
+                        raise ConnectionError(f"{self.channel} server closed the connection before acknowledging")
+                    if reply.rstrip() != b"OK":
+                        raise ConnectionError(f"{self.channel} server rejected the batch: {reply.strip()!r}")
+            except BaseException:
+                writer.close()
+                raise
+            self._idle.append((reader, writer))
+
+    async def close(self):
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+            await writer.wait_closed()
+
+
+class EmailSender(MessageSender):
+    channel = "email"
+
+    def format(self, recipient, message):
+        return f"EMAIL {recipient} {message}"
+
+
+class SMSSender(MessageSender):
+    channel = "sms"
+
+    def format(self, recipient, message):
+        return f"SMS {recipient} {message}"
+
+
+class PushSender(MessageSender):
+    channel = "push"
+
+    def format(self, recipient, message):
+        return f"PUSH {recipient} {message}"
+
+
+# ABSTRACTION SIDE
+# WHAT notifications are
+
+
+class Notification(ABC):
+    def __init__(self, dispatcher):
+        self.dispatcher = dispatcher
+
+    @property
+    @abstractmethod
+    def message(self):
+        pass
+
+    async def notify(self, recipients, channels):
+        for recipient in recipients:
+            for channel in channels:
+                await self.dispatcher.dispatch(channel, recipient, self.message)
+
+
+class OrderNotification(Notification):
+    message = "Your order has been placed."
+
+
+class PaymentNotification(Notification):
+    message = "Your payment was successful."
+
+
+class SecurityAlert(Notification):
+    message = "Suspicious login detected!"
+
+
+class NotificationDispatcher:
+    """
+    One bounded queue and a few workers per channel. dispatch() waits when
+    a channel's queue is full, so a slow channel pushes back on the producer
+    instead of buffering without limit. Workers drain up to batch_size
+    queued messages and hand them to sender.send_many.
+    """
+    def __init__(self, senders, queue_size=10_000, workers_per_channel=4, batch_size=200):
+        self.senders = {sender.channel: sender for sender in senders}
+        self.queue_size = queue_size
+        self.workers_per_channel = workers_per_channel
+        self.batch_size = batch_size
+        self.queues = {}
+        self.sent = {channel: 0 for channel in self.senders}
+        self.failed = {channel: 0 for channel in self.senders}
+        self._workers = []
+
+    async def start(self):
+        for channel, sender in self.senders.items():
+            queue = self.queues[channel] = asyncio.Queue(self.queue_size)
+            for _ in range(self.workers_per_channel):
+                self._workers.append(asyncio.create_task(self._work(channel, sender, queue)))
+
+    async def dispatch(self, channel, recipient, message):
+        await self.queues[channel].put((recipient, message))
+
+    async def _work(self, channel, sender, queue):
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await sender.send_many(batch)
+                self.sent[channel] += len(batch)
+            except Exception:
+                # Network errors and messages that can't be formatted or
+                # encoded alike: count the batch and keep the worker alive
+                self.failed[channel] += len(batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def close(self):
+        for queue in self.queues.values():
+            await queue.join()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        for sender in self.senders.values():
+            await sender.close()
+
+
+# Local stand-in for a channel provider: one "OK" line per message line,
+# plus a fixed delay per read to simulate the network round trip
+class StubChannelServer:
+    def __init__(self, delay=0.001):
+        self.delay = delay
+        self.received = 0
+        self.server = None
+        self.port = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                lines = data.count(b"\n")
+                self.received += lines
+                await asyncio.sleep(self.delay)
+                writer.write(b"OK\n" * lines)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+async def benchmark(recipients=20_000, sequential_recipients=500):
+    servers = {channel: StubChannelServer() for channel in ("email", "sms", "push")}
+    for server in servers.values():
+        await server.start()
+
+    def make_senders():
+        return [
+            EmailSender("127.0.0.1", servers["email"].port),
+            SMSSender("127.0.0.1", servers["sms"].port),
+            PushSender("127.0.0.1", servers["push"].port),
+        ]
+
+    # Before: one message, one channel, one round trip at a time
+    senders = make_senders()
+    start = time.perf_counter()
+    for i in range(sequential_recipients):
+        for sender in senders:
+            await sender.send(f"user{i}", OrderNotification.message)
+    sequential = sequential_recipients * len(senders) / (time.perf_counter() - start)
+    for sender in senders:
+        await sender.close()
+
+    dispatcher = NotificationDispatcher(make_senders())
+    await dispatcher.start()
+    start = time.perf_counter()
+    await OrderNotification(dispatcher).notify((f"user{i}" for i in range(recipients)), ["email", "sms", "push"])
+    await dispatcher.close()
+    dispatched = recipients * 3 / (time.perf_counter() - start)
+
+    print(f"sequential send : {sequential:10,.0f} messages/sec")
+    print(f"dispatcher      : {dispatched:10,.0f} messages/sec  sent={dispatcher.sent} failed={dispatcher.failed}")
+    for server in servers.values():
+        await server.stop()
+
+
+# Usage
+
+asyncio.run(benchmark())
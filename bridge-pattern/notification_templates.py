@@ -0,0 +1,162 @@
+import re
+import time
+from abc import ABC, abstractmethod
+
+# IMPLEMENTATION SIDE
+# HOW messages are sent
+
+
+class MessageSender(ABC):
+    @abstractmethod
+    def send(self, message):
+        pass
+
+
+class EmailSender(MessageSender):
+    def send(self, message):
+        print(f"Sending EMAIL: {message}")
+
+
+class SMSSender(MessageSender):
+    def send(self, message):
+        print(f"Sending SMS: {message}")
+
+
+class NullSender(MessageSender):
+    # Keeps the benchmark about rendering, not printing
+    def send(self, message):
+        pass
+
+
+# TEMPLATES
+# "Hi {name}, you paid {amount:.2f}" is parsed once into a small function
+# built from an f-string, rendering is then a single call
+
+_TOKEN = re.compile(r"\{\{|\}\}|\{([A-Za-z_]\w*)(?::([\w.,<>^=+\- #%]*))?\}|[{}]")
+
+
+class TemplateError(ValueError):
+    pass
+
+
+class CompiledTemplate:
+    def __init__(self, source):
+        self.source = source
+        self.fields = []
+        pieces = []
+        position = 0
+        for match in _TOKEN.finditer(source):
+            pieces.append(repr(source[position:match.start()]))
+            position = match.end()
+            token = match.group()
+            if token in ("{{", "}}"):
+                pieces.append(repr(token[0]))
+            elif match.group(1) is None:
+                raise TemplateError(f"Invalid placeholder or stray {token!r} at {match.start()} in {source!r}")
+            else:
+                name, spec = match.group(1), match.group(2)
+                self.fields.append(name)
+                pieces.append('f"{p[%r]%s}"' % (name, ":" + spec if spec else ""))
+        pieces.append(repr(source[position:]))
+        # Adjacent literals are joined by the compiler into one f-string
+        self.render = eval(f"lambda p: {' '.join(pieces)}", {"__builtins__": {}})
+
+    def __repr__(self):
+        return f"CompiledTemplate({self.source!r})"
+
+
+class TemplateRenderer:
+    """
+    Compiles each template source once, rendering is then one call to the
+    compiled function. Rendered messages are not cached: with a compiled
+    template, building a cache key and probing an LRU cost more than rendering.
+    """
+    def __init__(self):
+        self.templates = {}
+
+    def compile(self, source):
+        template = self.templates.get(source)
+        if template is None:
+            template = self.templates[source] = CompiledTemplate(source)
+        return template
+
+    def render(self, source, params):
+        return self.compile(source).render(params)
+
+
+default_renderer = TemplateRenderer()
+
+
+# ABSTRACTION SIDE
+# WHAT notifications are
+
+
+class Notification(ABC):
+    renderer = default_renderer
+
+    def __init__(self, sender):
+        self.sender = sender
+
+    @property
+    @abstractmethod
+    def template(self):
+        pass
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if isinstance(cls.__dict__.get("template"), str):
+            cls.renderer.compile(cls.template)  # fail fast on a broken template
+
+    def notify(self, **params):
+        self.sender.send(self.renderer.render(self.template, params))
+
+
+class OrderNotification(Notification):
+    template = "Hi {name}, your order #{order_id} has been placed."
+
+
+class PaymentNotification(Notification):
+    template = "Hi {name}, your payment of {amount:.2f} {currency} was successful."
+
+
+class SecurityAlert(Notification):
+    template = "Suspicious login detected for {name} from {ip}!"
+
+
+def benchmark(messages=1_000_000):
+    source = PaymentNotification.template
+    names = [f"user{i}" for i in range(1000)]
+    params = [
+        {"name": names[i % 1000], "amount": (i % 500) / 4, "currency": "USD"}
+        for i in range(messages)
+    ]
+    template = CompiledTemplate(source)
+
+    renderer = TemplateRenderer()
+    notification = PaymentNotification(NullSender())
+    runs = (
+        ("str.format per message", lambda p: source.format(**p)),
+        ("compiled template", template.render),
+        ("renderer", lambda p: renderer.render(source, p)),
+        ("notify() end to end", lambda p: notification.notify(**p)),
+    )
+
+    print(f"{messages:,} personalized messages")
+    for name, render in runs:
+        start = time.perf_counter()
+        for p in params:
+            render(p)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<24} {elapsed:6.2f}s  {messages / elapsed:12,.0f} messages/sec")
+
+
+# Usage
+
+email_sender = EmailSender()
+sms_sender = SMSSender()
+
+OrderNotification(email_sender).notify(name="Alice", order_id=1234)
+PaymentNotification(sms_sender).notify(name="Bob", amount=499.5, currency="INR")
+SecurityAlert(email_sender).notify(name="Alice", ip="10.0.0.7")
+
+benchmark()
@@ -0,0 +1,263 @@
+# Decorator pattern: Micro-batching
+#
+# @batched wraps a bulk function (list of items -> list of results) and gives
+# back a per-item function. Concurrent single calls, from threads or from
+# asyncio tasks, are collected for up to max_delay seconds or max_size items
+# and sent to the bulk function in one go.
+import asyncio
+import functools
+import inspect
+import statistics
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+def run_batch(bulk, items, retry_individually=False):
+    """
+    Call bulk(items) and return one (ok, result_or_exception) per item.
+    An item whose result is an exception fails alone. If the bulk call
+    itself raises, the exception goes to every item: some of them may have
+    gone through before it failed, so they are only called again one by
+    one when retry_individually is set, for bulk functions that are safe
+    to repeat.
+    """
+    try:
+        results = bulk(items)
+    except Exception:
+        if not retry_individually or len(items) == 1:
+            raise
+        outcomes = []
+        for item in items:
+            try:
+                outcomes.extend(run_batch(bulk, [item]))
+            except Exception as exc:
+                outcomes.append((False, exc))
+        return outcomes
+    if len(results) != len(items):
+        raise ValueError(f"{bulk.__name__} returned {len(results)} results for {len(items)} items")
+    return [(not isinstance(result, Exception), result) for result in results]
+
+
+async def run_batch_async(bulk, items, retry_individually=False):
+    try:
+        results = await bulk(items)
+    except Exception:
+        if not retry_individually or len(items) == 1:
+            raise
+        outcomes = []
+        for item in items:
+            try:
+                outcomes.extend(await run_batch_async(bulk, [item]))
+            except Exception as exc:
+                outcomes.append((False, exc))
+        return outcomes
+    if len(results) != len(items):
+        raise ValueError(f"{bulk.__name__} returned {len(results)} results for {len(items)} items")
+    return [(not isinstance(result, Exception), result) for result in results]
+
+
+def settle(futures, outcomes):
+    for future, (ok, result) in zip(futures, outcomes):
+        if future.done():
+            # The caller was cancelled, nobody is waiting for this one
+            continue
+        if ok:
+            future.set_result(result)
+        else:
+            future.set_exception(result)
+
+
+class ThreadBatcher:
+    def __init__(self, bulk, max_size, max_delay, retry_individually=False):
+        self.bulk = bulk
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.retry_individually = retry_individually
+        self.items = []
+        self.futures = []
+        self.ready = threading.Condition()
+        self.worker = None
+
+    def submit(self, item):
+        future = Future()
+        with self.ready:
+            self.items.append(item)
+            self.futures.append(future)
+            if self.worker is None:
+                self.worker = threading.Thread(target=self._run, daemon=True)
+                self.worker.start()
+            self.ready.notify()
+        return future
+
+    def _take_batch(self):
+        with self.ready:
+            while not self.items:
+                self.ready.wait()
+            deadline = time.monotonic() + self.max_delay
+            while len(self.items) < self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.ready.wait(remaining)
+            items, futures = self.items[:self.max_size], self.futures[:self.max_size]
+            del self.items[:self.max_size], self.futures[:self.max_size]
+            return items, futures
+
+    def _run(self):
+        while True:
+            items, futures = self._take_batch()
+            try:
+                outcomes = run_batch(self.bulk, items, self.retry_individually)
+            except Exception as exc:
+                outcomes = [(False, exc)] * len(items)
+            settle(futures, outcomes)
+
+
+class AsyncBatcher:
+    def __init__(self, bulk, max_size, max_delay, retry_individually=False):
+        self.bulk = bulk
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.retry_individually = retry_individually
+        self.items = []
+        self.futures = []
+        self.timer = None
+        self.sending = set()
+        self.loop = None
+
+    def submit(self, item):
+        loop = asyncio.get_running_loop()
+        if loop is not self.loop:
+            # Whatever was pending belongs to a loop that is gone (an earlier
+            # asyncio.run), its timer will never fire and nobody awaits it
+            self.loop = loop
+            self.items, self.futures = [], []
+            self.timer = None
+            self.sending = set()
+        future = loop.create_future()
+        self.items.append(item)
+        self.futures.append(future)
+        if len(self.items) >= self.max_size:
+            self._flush()
+        elif self.timer is None:
+            self.timer = loop.call_later(self.max_delay, self._flush)
+        return future
+
+    def _flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        items, futures = self.items, self.futures
+        self.items, self.futures = [], []
+        if items:
+            task = asyncio.get_running_loop().create_task(self._send(items, futures))
+            self.sending.add(task)
+            task.add_done_callback(self.sending.discard)
+
+    async def _send(self, items, futures):
+        try:
+            outcomes = await run_batch_async(self.bulk, items, self.retry_individually)
+        except Exception as exc:
+            outcomes = [(False, exc)] * len(items)
+        settle(futures, outcomes)
+
+
+def batched(max_size=100, max_delay=0.005, retry_individually=False):
+    def decorator(bulk):
+        if inspect.iscoroutinefunction(bulk):
+            batcher = AsyncBatcher(bulk, max_size, max_delay, retry_individually)
+
+            @functools.wraps(bulk)
+            async def async_wrapper(item):
+                return await batcher.submit(item)
+
+            async_wrapper.bulk = bulk
+            return async_wrapper
+
+        batcher = ThreadBatcher(bulk, max_size, max_delay, retry_individually)
+
+        @functools.wraps(bulk)
+        def wrapper(item):
+            return batcher.submit(item).result()
+
+        wrapper.bulk = bulk
+        return wrapper
+
+    return decorator
+
+
+# Stand-in backend: every call costs a round trip, every item a little more,
+# and only a few connections can be open at once
+ROUND_TRIP = 0.002
+PER_ITEM = 0.00001
+BACKEND_CONNECTIONS = threading.Semaphore(4)
+
+
+def send_many(messages):
+    with BACKEND_CONNECTIONS:
+        time.sleep(ROUND_TRIP + PER_ITEM * len(messages))
+    return [f"sent {message}" for message in messages]
+
+
+def send(message):
+    return send_many([message])[0]
+
+
+def measure(func, calls, threads):
+    latencies = []
+
+    def call(i):
+        start = time.perf_counter()
+        func(f"message {i}")
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(call, range(calls)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return calls / elapsed, statistics.median(latencies), latencies[int(len(latencies) * 0.99)]
+
+
+def benchmark(calls=2000, threads=64):
+    batched_send = batched(max_size=64, max_delay=0.002)(send_many)
+    for name, func in (("unbatched", send), ("batched", batched_send)):
+        throughput, p50, p99 = measure(func, calls, threads)
+        print(f"{name:<10} {throughput:8,.0f} calls/sec  p50={p50 * 1000:.1f}ms p99={p99 * 1000:.1f}ms")
+
+
+# Usage
+@batched(max_size=10, max_delay=0.01)
+def pay_many(amounts):
+    print(f"Paying {len(amounts)} amounts in one bulk call")
+    return [ValueError("amount must be positive") if amount <= 0 else f"Paid {amount}" for amount in amounts]
+
+
+@batched(max_size=10, max_delay=0.01)
+async def push_many(messages):
+    print(f"Sending {len(messages)} PUSH notifications in one bulk call")
+    await asyncio.sleep(0.001)
+    return [f"Sending PUSH notification: {message}" for message in messages]
+
+
+def pay(amount):
+    try:
+        return pay_many(amount)
+    except ValueError as exc:
+        return f"Failed {amount}: {exc}"
+
+
+with ThreadPoolExecutor(max_workers=5) as pool:
+    for result in pool.map(pay, [100, 200, -5, 300, 400]):
+        print(result)
+
+
+async def notify_all():
+    return await asyncio.gather(*(push_many(f"Order {i} shipped") for i in range(5)))
+
+
+for result in asyncio.run(notify_all()):
+    print(result)
+
+benchmark()
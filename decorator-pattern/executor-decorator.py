@@ -0,0 +1,144 @@
+# Decorator pattern: Offloading work to executors
+#
+# @run_in_thread_pool and @run_in_process_pool turn a function into one that
+# returns a concurrent.futures.Future, wherever it is called from. Coroutines
+# use the .run_async(...) entry point instead, which gives back an awaitable.
+# Both share one bounded pool per kind, created on first use and shut down at
+# exit.
+import asyncio
+import atexit
+import functools
+import importlib
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+_pools = {}
+_pool_sizes = {"thread": min(32, (os.cpu_count() or 1) + 4), "process": os.cpu_count() or 1}
+_pools_lock = threading.Lock()
+
+
+def configure_pools(thread_workers=None, process_workers=None):
+    # Only affects pools that have not been created yet
+    if thread_workers is not None:
+        _pool_sizes["thread"] = thread_workers
+    if process_workers is not None:
+        _pool_sizes["process"] = process_workers
+
+
+def get_pool(kind):
+    with _pools_lock:
+        if kind not in _pools:
+            executor = ThreadPoolExecutor if kind == "thread" else ProcessPoolExecutor
+            _pools[kind] = executor(max_workers=_pool_sizes[kind])
+        return _pools[kind]
+
+
+@atexit.register
+def shutdown_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=True)
+
+
+def _add_entry_points(wrapper):
+    # wrapper(...) and wrapper.submit(...) -> concurrent.futures.Future
+    # await wrapper.run_async(...) -> the result, without blocking the loop
+    def run_async(*args, **kwargs):
+        return asyncio.wrap_future(wrapper(*args, **kwargs))
+
+    wrapper.submit = wrapper
+    wrapper.run_async = run_async
+    return wrapper
+
+
+def run_in_thread_pool(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return get_pool("thread").submit(func, *args, **kwargs)
+
+    return _add_entry_points(wrapper)
+
+
+def _call_wrapped(module_name, qualname, args, kwargs):
+    # Runs in the worker: look the decorated function up by name and call
+    # the original, the wrapper itself cannot be pickled by reference
+    target = sys.modules.get(module_name) or importlib.import_module(module_name)
+    for part in qualname.split("."):
+        target = getattr(target, part)
+    return target.__wrapped__(*args, **kwargs)
+
+
+def run_in_process_pool(func):
+    if "<locals>" in func.__qualname__ or "<lambda>" in func.__qualname__:
+        raise TypeError(f"{func.__qualname__} must be defined at module level to run in a process pool")
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # Arguments are pickled once, by the pool's feeder thread on the way
+        # to the worker. Arguments that can't be pickled fail the returned
+        # future with the pickling error, submit itself doesn't raise
+        return get_pool("process").submit(_call_wrapped, func.__module__, func.__qualname__, args, kwargs)
+
+    return _add_entry_points(wrapper)
+
+
+# Usage
+@run_in_process_pool
+def count_primes(limit):
+    count = 0
+    for number in range(2, limit):
+        if all(number % divisor for divisor in range(2, int(number ** 0.5) + 1)):
+            count += 1
+    return count
+
+
+@run_in_thread_pool
+def download(url):
+    time.sleep(0.05)  # stands in for network I/O
+    return f"content of {url}"
+
+
+def benchmark(cpu_jobs=8, limit=30_000, io_jobs=32):
+    print(f"{os.cpu_count()} CPUs")
+
+    start = time.perf_counter()
+    sequential = [count_primes.__wrapped__(limit) for _ in range(cpu_jobs)]
+    cpu_sequential = time.perf_counter() - start
+    start = time.perf_counter()
+    futures = [count_primes(limit) for _ in range(cpu_jobs)]
+    assert [future.result() for future in futures] == sequential
+    cpu_pool = time.perf_counter() - start
+    print(f"CPU-bound {cpu_jobs} jobs: sequential={cpu_sequential:.2f}s process pool={cpu_pool:.2f}s "
+          f"speedup={cpu_sequential / cpu_pool:.1f}x")
+
+    urls = [f"www.example.org/{i}" for i in range(io_jobs)]
+    start = time.perf_counter()
+    [download.__wrapped__(url) for url in urls]
+    io_sequential = time.perf_counter() - start
+    start = time.perf_counter()
+    [future.result() for future in [download(url) for url in urls]]
+    io_pool = time.perf_counter() - start
+    print(f"I/O-bound {io_jobs} jobs: sequential={io_sequential:.2f}s thread pool={io_pool:.2f}s "
+          f"speedup={io_sequential / io_pool:.1f}x")
+
+
+def fetch_all(urls):
+    # A plain helper, fine to call from sync code and from a coroutine alike
+    return [future.result() for future in [download(url) for url in urls]]
+
+
+async def main():
+    pages = await asyncio.gather(*(download.run_async(f"www.example.org/{i}") for i in range(3)))
+    print(pages)
+    print("primes below 10000:", await count_primes.run_async(10_000))
+    print(fetch_all(["www.example.org/sync"]))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+    benchmark()
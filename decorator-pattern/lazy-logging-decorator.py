@@ -0,0 +1,104 @@
+# Decorator pattern: Logging that costs nothing when it is switched off
+import asyncio
+import functools
+import inspect
+import logging
+import timeit
+
+logger = logging.getLogger("decorator-pattern")
+
+
+class LazyCall:
+    # Formats the arguments only if a handler really emits the record
+    def __init__(self, args, kwargs):
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self):
+        parts = [repr(arg) for arg in self.args]
+        parts += [f"{key}={value!r}" for key, value in self.kwargs.items()]
+        return ", ".join(parts)
+
+
+def log(message=None, logger=logger, level=logging.DEBUG):
+    # Whether logging is on is decided once, when the function is decorated.
+    # When it is off the original function is returned untouched.
+    def decorator(func):
+        if not logger.isEnabledFor(level):
+            return func
+
+        name = func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if message:
+                    logger.log(level, message)
+                logger.log(level, "%s(%s) started", name, LazyCall(args, kwargs))
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception:
+                    logger.log(level, "%s raised", name, exc_info=True)
+                    raise
+                logger.log(level, "%s returned %r", name, result)
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if message:
+                logger.log(level, message)
+            logger.log(level, "%s(%s) started", name, LazyCall(args, kwargs))
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                logger.log(level, "%s raised", name, exc_info=True)
+                raise
+            logger.log(level, "%s returned %r", name, result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def add(a, b):
+    return a + b
+
+
+def benchmark(number=1_000_000):
+    bare = timeit.timeit(lambda: add(3, 5), number=number)
+
+    logger.setLevel(logging.WARNING)
+    disabled = log()(add)
+
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    logger.addHandler(logging.NullHandler())
+    enabled = log()(add)
+
+    print(f"disabled returns original: {disabled is add}")
+    for name, func in (("bare", add), ("disabled", disabled), ("enabled", enabled)):
+        seconds = timeit.timeit(lambda: func(3, 5), number=number)
+        print(f"{name:<9} {seconds / number * 1e9:7.0f} ns/call  overhead {(seconds - bare) / number * 1e9:6.0f} ns")
+
+
+# Usage
+logging.basicConfig(level=logging.DEBUG, format="%(levelname)s %(message)s")
+
+
+@log("Test Message")
+def multiply(a, b):
+    return a * b
+
+
+@log()
+async def fetch(url, timeout=1):
+    await asyncio.sleep(0)
+    return f"content of {url}"
+
+
+print(multiply(3, 5))
+print(asyncio.run(fetch("www.reddit.org", timeout=2)))
+benchmark()
@@ -0,0 +1,247 @@
+# Decorator pattern: Memoization (LRU + TTL)
+import functools
+import threading
+import time
+import timeit
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+
+_KWARGS_MARK = object()
+_MISSING = object()
+
+
+def make_key(args, kwargs, typed):
+    key = args
+    if kwargs:
+        key += (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+    if typed:
+        key += tuple(type(arg) for arg in args)
+        if kwargs:
+            key += tuple(type(value) for _, value in sorted(kwargs.items()))
+    return key
+
+
+class LRUCache:
+    # OrderedDict of key -> (value, expires_at), oldest first. owner is the
+    # id() of the instance a per-instance cache belongs to
+    def __init__(self, maxsize=128, ttl=None, owner=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.owner = owner
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __reduce__(self):
+        # Pickled or deep-copied along with its instance: start empty
+        return type(self), (self.maxsize, self.ttl)
+
+    def get(self, key):
+        with self.lock:
+            entry = self.data.get(key, _MISSING)
+            if entry is not _MISSING:
+                value, expires_at = entry
+                if expires_at is None or expires_at >= time.monotonic():
+                    self.data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self.data[key]
+            self.misses += 1
+            return _MISSING
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self.lock:
+            self.data[key] = (value, expires_at)
+            self.data.move_to_end(key)
+            if self.maxsize is not None and len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def pop(self, key):
+        with self.lock:
+            return self.data.pop(key, _MISSING) is not _MISSING
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+
+
+class Memoized:
+    def __init__(self, func, maxsize, ttl, typed, key):
+        functools.update_wrapper(self, func)
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.typed = typed
+        self.key = key
+        self._cache = LRUCache(maxsize, ttl)
+        # Methods get one cache per instance, stored in the instance's own
+        # __dict__ like functools.cached_property. The instance needs no
+        # __hash__, and a cached result that refers back to self is only a
+        # reference cycle the garbage collector can free. A cache carries
+        # its owner's id, so a copy.copy of the instance, which shares the
+        # __dict__ values, gets a cache of its own on first call. Pickling
+        # or deep-copying the instance leaves the cache behind. The caches
+        # are tracked here by weak reference, for stats() and cache_clear().
+        self._attr = f"__memoize_{func.__name__}"
+        self._instance_caches = {}
+        self._lock = threading.Lock()
+
+    def __set_name__(self, owner, name):
+        self._attr = f"__memoize_{name}"
+
+    def _make_key(self, args, kwargs):
+        if self.key is not None:
+            return self.key(*args, **kwargs)
+        if not kwargs and not self.typed:
+            return args
+        return make_key(args, kwargs, self.typed)
+
+    def _call(self, cache, func, args, kwargs):
+        key = self._make_key(args, kwargs)
+        value = cache.get(key)
+        if value is _MISSING:
+            value = func(*args, **kwargs)
+            cache.set(key, value)
+        return value
+
+    def __call__(self, *args, **kwargs):
+        return self._call(self._cache, self.__wrapped__, args, kwargs)
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            namespace = instance.__dict__
+        except AttributeError:
+            raise TypeError(
+                f"@memoize on {owner.__name__}.{self.__name__} needs instances with a __dict__"
+            ) from None
+        owner = id(instance)
+        cache = namespace.get(self._attr)
+        if cache is None or cache.owner != owner:
+            with self._lock:
+                cache = namespace.get(self._attr)
+                if cache is None or cache.owner != owner:
+                    cache = namespace[self._attr] = LRUCache(self.maxsize, self.ttl, owner)
+                    key = id(cache)
+                    self._instance_caches[key] = weakref.ref(
+                        cache, lambda _, key=key: self._instance_caches.pop(key, None)
+                    )
+        return BoundMemoized(self, cache, self.__wrapped__.__get__(instance, owner))
+
+    def _live_instance_caches(self):
+        caches = (ref() for ref in list(self._instance_caches.values()))
+        return [cache for cache in caches if cache is not None]
+
+    def invalidate(self, *args, **kwargs):
+        return self._cache.pop(self._make_key(args, kwargs))
+
+    def cache_clear(self):
+        self._cache.clear()
+        for cache in self._live_instance_caches():
+            cache.clear()
+
+    def stats(self):
+        # Per-instance caches only count while their instance is alive
+        caches = [self._cache] + self._live_instance_caches()
+        hits = sum(cache.hits for cache in caches)
+        misses = sum(cache.misses for cache in caches)
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "size": sum(len(cache.data) for cache in caches),
+            "instances": len(caches) - 1,
+        }
+
+
+class BoundMemoized:
+    def __init__(self, memoized, cache, method):
+        self._memoized = memoized
+        self._cache = cache
+        self._method = method
+
+    def __call__(self, *args, **kwargs):
+        return self._memoized._call(self._cache, self._method, args, kwargs)
+
+    def invalidate(self, *args, **kwargs):
+        return self._cache.pop(self._memoized._make_key(args, kwargs))
+
+    def cache_clear(self):
+        self._cache.clear()
+
+
+def memoize(maxsize=128, ttl=None, typed=False, key=None):
+    # maxsize=None -> unbounded, ttl in seconds, key(*args, **kwargs) -> hashable
+    def decorator(func):
+        return Memoized(func, maxsize, ttl, typed, key)
+
+    return decorator
+
+
+def benchmark(number=500_000):
+    def add(a, b):
+        return a + b
+
+    lru_add = functools.lru_cache(maxsize=128)(add)
+    memo_add = memoize(maxsize=128)(add)
+    memo_ttl_add = memoize(maxsize=128, ttl=60)(add)
+    for name, func in (("bare", add), ("lru_cache", lru_add), ("memoize", memo_add), ("memoize+ttl", memo_ttl_add)):
+        func(3, 5)
+        seconds = timeit.timeit(lambda: func(3, 5), number=number)
+        print(f"{name:<12} {seconds / number * 1e9:6.0f} ns/hit")
+
+
+# Usage
+@memoize(maxsize=2, ttl=1)
+def add(x, y):
+    print("Performing add operation")
+    return x + y
+
+
+@memoize(key=lambda numbers: tuple(numbers))
+def total(numbers):
+    print("Summing list")
+    return sum(numbers)
+
+
+class Calculator:
+    @memoize(typed=True)
+    def multiply(self, x, y):
+        print("Performing multiply operation")
+        return x * y
+
+
+add(10, 5)
+add(10, 5)  # cached
+add.invalidate(10, 5)
+add(10, 5)  # computed again
+total([1, 2, 3])
+total([1, 2, 3])  # cached, lists are turned into tuples by the key function
+
+calculator = Calculator()
+calculator.multiply(3, 4)
+calculator.multiply(3, 4)  # cached
+calculator.multiply(3.0, 4)  # typed=True -> separate entry
+print(Calculator.multiply.stats())
+del calculator  # its cache goes with it
+print(Calculator.multiply.stats())
+
+
+@dataclass
+class Point:  # defines __eq__ without __hash__, still fine
+    x: float
+    y: float
+
+    @memoize()
+    def scaled(self, factor):
+        return Point(self.x * factor, self.y * factor)
+
+
+point = Point(1, 2)
+print(point.scaled(3), point.scaled(3) is point.scaled(3))
+print(add.stats())
+
+benchmark()
@@ -0,0 +1,164 @@
+# Decorator pattern: Timing with latency histograms
+import asyncio
+import functools
+import inspect
+import json
+import threading
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+
+# 2 ** SUB_BITS buckets per power of two, about 6% relative precision
+SUB_BITS = 4
+SUB_COUNT = 1 << SUB_BITS
+BUCKET_COUNT = 64 * SUB_COUNT
+
+
+def bucket_index(value):
+    # HDR-style log-linear bucket: exact below 2 ** (SUB_BITS + 1) ns,
+    # above that the top SUB_BITS bits after the leading one pick the bucket
+    shift = value.bit_length() - SUB_BITS - 1
+    if shift <= 0:
+        return value
+    return (shift + 1) * SUB_COUNT + (value >> shift) - SUB_COUNT
+
+
+def bucket_upper_bound(index):
+    power, offset = divmod(index, SUB_COUNT)
+    if power <= 1:
+        return index
+    shift = power - 1
+    return ((SUB_COUNT + offset + 1) << shift) - 1
+
+
+class Histogram:
+    # Fixed buckets allocated once, record() only bumps counters
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self._lock = threading.Lock()
+
+    def record(self, value):
+        # bucket_index() inlined, this runs on every timed call
+        shift = value.bit_length() - SUB_BITS - 1
+        index = value if shift <= 0 else (shift + 1) * SUB_COUNT + (value >> shift) - SUB_COUNT
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+            if value > self.max:
+                self.max = value
+
+    def percentile(self, p):
+        target = p / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= target:
+                return min(bucket_upper_bound(index), self.max)
+        return self.max
+
+    def snapshot(self):
+        with self._lock:
+            if not self.count:
+                return {"count": 0}
+            return {
+                "count": self.count,
+                "mean_us": self.total / self.count / 1000,
+                "p50_us": self.percentile(50) / 1000,
+                "p95_us": self.percentile(95) / 1000,
+                "p99_us": self.percentile(99) / 1000,
+                "max_us": self.max / 1000,
+            }
+
+
+class TimingRegistry:
+    def __init__(self):
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name):
+        with self._lock:
+            return self.histograms.setdefault(name, Histogram())
+
+    def snapshot(self):
+        with self._lock:
+            histograms = dict(self.histograms)
+        return {name: histogram.snapshot() for name, histogram in histograms.items()}
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+
+registry = TimingRegistry()
+
+
+def timed(name=None, registry=registry):
+    def decorator(func):
+        histogram = registry.histogram(name or f"{func.__module__}.{func.__qualname__}")
+        record = histogram.record
+        clock = time.perf_counter_ns
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = clock()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    record(clock() - start)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(clock() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def benchmark(number=500_000, threads=8):
+    def add(a, b):
+        return a + b
+
+    timed_add = timed("benchmark.add", registry=TimingRegistry())(add)
+    bare = timeit.timeit(lambda: add(3, 5), number=number)
+    wrapped = timeit.timeit(lambda: timed_add(3, 5), number=number)
+    print(f"bare  {bare / number * 1e9:6.0f} ns/call")
+    print(f"timed {wrapped / number * 1e9:6.0f} ns/call  overhead {(wrapped - bare) / number * 1e9:.0f} ns")
+
+    shared = TimingRegistry()
+    counted = timed("benchmark.threads", registry=shared)(add)
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for _ in range(threads):
+            pool.submit(lambda: [counted(1, 2) for _ in range(10_000)])
+    print(f"{threads} threads x 10000 calls -> count={shared.snapshot()['benchmark.threads']['count']}")
+
+
+# Usage
+@timed()
+def slow_add(a, b):
+    time.sleep(0.001)
+    return a + b
+
+
+@timed()
+async def fetch(url):
+    await asyncio.sleep(0.002)
+    return f"content of {url}"
+
+
+for i in range(100):
+    slow_add(i, i)
+asyncio.run(fetch("www.reddit.org"))
+
+print(registry.to_json())
+benchmark()
@@ -0,0 +1,195 @@
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class CPU:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def start(self):
+        time.sleep(self.delay)
+        print("CPU started")
+
+
+class Memory:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def load(self):
+        time.sleep(self.delay)
+        print("Memory loaded")
+
+
+class HardDisk:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def read(self):
+        time.sleep(self.delay)
+        print("Reading from hard disk")
+
+
+class StartupError(RuntimeError):
+    pass
+
+
+class StepTiming:
+    def __init__(self, name, started, finished, thread):
+        self.name = name
+        self.started = started
+        self.finished = finished
+        self.thread = thread
+
+    @property
+    def duration(self):
+        return self.finished - self.started
+
+
+class StartupPlan:
+    """
+    Named startup steps and what each must wait for. run() starts every step
+    as soon as all of its dependencies have finished, so independent steps
+    overlap and the total is the longest chain instead of the sum.
+    """
+    def __init__(self):
+        self.steps = {}
+        self.after = {}
+
+    def step(self, name, action, after=()):
+        if name in self.steps:
+            raise ValueError(f"Duplicate startup step {name!r}")
+        self.steps[name] = action
+        self.after[name] = tuple(after)
+        return self
+
+    def order(self):
+        # Kahn's algorithm, also catches unknown dependencies and cycles
+        for name, after in self.after.items():
+            for dependency in after:
+                if dependency not in self.steps:
+                    raise ValueError(f"Step {name!r} depends on unknown step {dependency!r}")
+        waiting = {name: len(after) for name, after in self.after.items()}
+        dependents = {name: [] for name in self.steps}
+        for name, after in self.after.items():
+            for dependency in after:
+                dependents[dependency].append(name)
+        ready = [name for name, count in waiting.items() if count == 0]
+        ordered = []
+        while ready:
+            name = ready.pop()
+            ordered.append(name)
+            for dependent in dependents[name]:
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    ready.append(dependent)
+        if len(ordered) != len(self.steps):
+            stuck = sorted(set(self.steps) - set(ordered))
+            raise ValueError(f"Startup steps form a cycle: {stuck}")
+        return ordered, dependents
+
+    def _timed(self, name, origin):
+        started = time.perf_counter() - origin
+        self.steps[name]()
+        return StepTiming(name, started, time.perf_counter() - origin, threading.current_thread().name)
+
+    def run_sequential(self):
+        ordered, _ = self.order()
+        origin = time.perf_counter()
+        return [self._timed(name, origin) for name in ordered]
+
+    def run(self, workers=8):
+        ordered, dependents = self.order()
+        waiting = {name: len(self.after[name]) for name in ordered}
+        profile = []
+        origin = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="startup") as pool:
+            running = {
+                pool.submit(self._timed, name, origin): name for name in ordered if waiting[name] == 0
+            }
+            failed = None
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    if future.exception() is not None:
+                        # Let what is already running finish, start nothing new
+                        failed = failed or (name, future.exception())
+                        continue
+                    profile.append(future.result())
+                    if failed:
+                        continue
+                    for dependent in dependents[name]:
+                        waiting[dependent] -= 1
+                        if waiting[dependent] == 0:
+                            running[pool.submit(self._timed, dependent, origin)] = dependent
+        if failed:
+            name, error = failed
+            raise StartupError(f"Startup step {name!r} failed: {error}") from error
+        return profile
+
+
+def print_profile(profile, width=40):
+    total = max(timing.finished for timing in profile)
+    for timing in sorted(profile, key=lambda timing: timing.started):
+        offset = int(timing.started / total * width)
+        length = max(1, int(timing.duration / total * width))
+        print(f"  {timing.name:<14} {timing.duration * 1000:7.1f}ms  |{' ' * offset}{'#' * length}")
+
+
+class ComputerFacade:
+    def __init__(self, delay=0.0):
+        self.cpu = CPU(delay)
+        self.memory = Memory(delay)
+        self.hard_disk = HardDisk(delay)
+        # Memory and disk don't need each other, both need the CPU
+        self.plan = (
+            StartupPlan()
+            .step("cpu", self.cpu.start)
+            .step("memory", self.memory.load, after=["cpu"])
+            .step("hard_disk", self.hard_disk.read, after=["cpu"])
+        )
+        self.profile = []
+
+    def start(self):
+        self.profile = self.plan.run()
+        print("Computer started")
+
+
+def benchmark(subsystems=30, seed=7):
+    # A larger machine: a few layers of subsystems, each depending on one
+    # or two from the layer before, with 20-80ms simulated init each
+    rng = random.Random(seed)
+    plan = StartupPlan()
+    layers = [["firmware"]]
+    plan.step("firmware", lambda: time.sleep(0.03))
+    for i in range(subsystems - 1):
+        if i % 8 == 0:
+            layers.append([])
+        name = f"subsystem_{i:02d}"
+        parents = rng.sample(layers[-2], min(len(layers[-2]), rng.randint(1, 2)))
+        delay = rng.uniform(0.02, 0.08)
+        plan.step(name, lambda delay=delay: time.sleep(delay), after=parents)
+        layers[-1].append(name)
+
+    start = time.perf_counter()
+    plan.run_sequential()
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    profile = plan.run()
+    parallel = time.perf_counter() - start
+
+    print(f"{subsystems} subsystems in {len(layers)} layers")
+    print(f"sequential startup : {sequential * 1000:7.1f}ms")
+    print(f"parallel startup   : {parallel * 1000:7.1f}ms  ({sequential / parallel:.1f}x)")
+    slowest = sorted(profile, key=lambda timing: timing.duration, reverse=True)[:5]
+    print("slowest steps:", ", ".join(f"{t.name}={t.duration * 1000:.0f}ms" for t in slowest))
+
+
+computer = ComputerFacade(delay=0.05)
+computer.start()
+print_profile(computer.profile)
+
+benchmark()
@@ -0,0 +1,221 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Subsystem classes, each call costs `delay` like a real device round trip
+class Device:
+    def __init__(self, delay=0.0, verbose=True):
+        self.delay = delay
+        self.verbose = verbose
+        self.commands = 0
+
+    def _command(self, text):
+        time.sleep(self.delay)
+        self.commands += 1
+        if self.verbose:
+            print(text + "\n", end="")  # one write, devices run on several threads
+
+
+class Amplifier(Device):
+    def turn_on(self):
+        self._command("Amplifier turned on")
+
+    def turn_off(self):
+        self._command("Amplifier turned off")
+
+    def set_volume(self, level):
+        self._command(f"Amplifier volume set to {level}")
+
+    def apply(self, setting, value):
+        if setting == "power":
+            self.turn_on() if value else self.turn_off()
+        elif setting == "volume":
+            self.set_volume(value)
+
+
+class DVDPlayer(Device):
+    def play_movie(self, movie):
+        self._command(f"Playing movie: {movie}")
+
+    def stop_movie(self):
+        self._command("Stopping movie")
+
+    def apply(self, setting, value):
+        if setting == "movie":
+            self.play_movie(value) if value else self.stop_movie()
+
+
+class Projector(Device):
+    def turn_on(self):
+        self._command("Projector turned on")
+
+    def turn_off(self):
+        self._command("Projector turned off")
+
+    def apply(self, setting, value):
+        if setting == "power":
+            self.turn_on() if value else self.turn_off()
+
+
+class Lights(Device):
+    def dim_lights(self):
+        self._command("Dimming lights")
+
+    def brighten_lights(self):
+        self._command("Brightening lights")
+
+    def apply(self, setting, value):
+        if setting == "level":
+            self.dim_lights() if value == "dim" else self.brighten_lights()
+
+
+# Facade class
+class HomeTheaterFacade:
+    """
+    Remembers what it last told every device and only sends the commands
+    that change something. Commands for one device go out in order, devices
+    are driven concurrently. A device whose command fails is forgotten, so
+    the next scene sends it everything again.
+    """
+    def __init__(self, amplifier, dvd_player, projector, lights, workers=4, verbose=True):
+        self.devices = {
+            "amplifier": amplifier,
+            "dvd_player": dvd_player,
+            "projector": projector,
+            "lights": lights,
+        }
+        self.known = {name: {} for name in self.devices}
+        self.verbose = verbose
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="home-theater")
+
+    def diff(self, scene):
+        commands = {}
+        for name, settings in scene.items():
+            known = self.known[name]
+            changes = [(setting, value) for setting, value in settings.items()
+                       if setting not in known or known[setting] != value]
+            if changes:
+                commands[name] = changes
+        return commands
+
+    def _send(self, name, changes):
+        device = self.devices[name]
+        for setting, value in changes:
+            device.apply(setting, value)
+            self.known[name][setting] = value
+
+    def apply_scene(self, scene):
+        commands = self.diff(scene)
+        futures = {name: self._pool.submit(self._send, name, changes) for name, changes in commands.items()}
+        errors = []
+        for name, future in futures.items():
+            try:
+                future.result()
+            except Exception as error:
+                self.known[name] = {}
+                errors.append((name, error))
+        if errors:
+            name, error = errors[0]
+            raise RuntimeError(f"{len(errors)} device(s) failed, first {name}: {error}") from error
+        return sum(len(changes) for changes in commands.values())
+
+    def watch_movie(self, movie):
+        if self.verbose:
+            print("Get ready to watch a movie!")
+        return self.apply_scene({
+            "lights": {"level": "dim"},
+            "amplifier": {"power": True, "volume": 5},
+            "projector": {"power": True},
+            "dvd_player": {"movie": movie},
+        })
+
+    def end_movie(self):
+        if self.verbose:
+            print("Movie night is over!")
+        return self.apply_scene({
+            "dvd_player": {"movie": None},
+            "amplifier": {"power": False},
+            "projector": {"power": False},
+            "lights": {"level": "bright"},
+        })
+
+    def close(self):
+        self._pool.shutdown()
+
+
+# The original facade, every command every time, one after another
+class SequentialHomeTheaterFacade:
+    def __init__(self, amplifier, dvd_player, projector, lights):
+        self.amplifier = amplifier
+        self.dvd_player = dvd_player
+        self.projector = projector
+        self.lights = lights
+
+    def watch_movie(self, movie):
+        self.lights.dim_lights()
+        self.amplifier.turn_on()
+        self.amplifier.set_volume(5)
+        self.projector.turn_on()
+        self.dvd_player.play_movie(movie)
+
+    def end_movie(self):
+        self.dvd_player.stop_movie()
+        self.amplifier.turn_off()
+        self.projector.turn_off()
+        self.lights.brighten_lights()
+
+
+def benchmark(delay=0.02, rounds=10):
+    movies = ["Inception", "Inception", "Interstellar", "Tenet"]
+
+    def devices():
+        return Amplifier(delay, False), DVDPlayer(delay, False), Projector(delay, False), Lights(delay, False)
+
+    def session(theater):
+        # Channel surfing: switch movie a few times, then end the night
+        timings = []
+        for movie in movies:
+            start = time.perf_counter()
+            theater.watch_movie(movie)
+            timings.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        theater.end_movie()
+        timings.append(time.perf_counter() - start)
+        return timings
+
+    print(f"device delay {delay * 1000:.0f}ms, {rounds} sessions")
+    for name, facade in (
+        ("sequential, always", SequentialHomeTheaterFacade),
+        ("state diff, parallel", lambda *parts: HomeTheaterFacade(*parts, verbose=False)),
+    ):
+        parts = devices()
+        theater = facade(*parts)
+        timings = []
+        for _ in range(rounds):
+            timings.extend(session(theater))
+        if isinstance(theater, HomeTheaterFacade):
+            theater.close()
+        timings.sort()
+        commands = sum(device.commands for device in parts)
+        print(f"{name:<21} mean={sum(timings) / len(timings) * 1000:6.1f}ms  "
+              f"max={timings[-1] * 1000:6.1f}ms  commands={commands}")
+
+
+# Client code
+amplifier = Amplifier()
+dvd_player = DVDPlayer()
+projector = Projector()
+lights = Lights()
+
+home_theater = HomeTheaterFacade(amplifier, dvd_player, projector, lights)
+
+# Watching a movie using the Facade
+home_theater.watch_movie("Inception")
+# Switching movie only touches the DVD player
+print("commands sent:", home_theater.watch_movie("Interstellar"))
+
+# Ending the movie night
+home_theater.end_movie()
+home_theater.close()
+
+benchmark()
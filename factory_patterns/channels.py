@@ -0,0 +1,45 @@
+import time
+from abc import ABC, abstractmethod
+
+
+class Notification(ABC):
+    @abstractmethod
+    def send(self, message):
+        pass
+
+    def is_healthy(self):
+        return True
+
+
+class ChannelNotification(Notification):
+    # A real channel opens a connection and loads its config on construction
+    CONNECT_TIME = 0.002
+
+    def __init__(self):
+        time.sleep(self.CONNECT_TIME)
+        self.connected = True
+        self.sent = 0
+
+    def is_healthy(self):
+        return self.connected
+
+    def close(self):
+        self.connected = False
+
+
+class EmailNotification(ChannelNotification):
+    def send(self, message):
+        self.sent += 1
+        return f"Sending Email: {message}"
+
+
+class SMSNotification(ChannelNotification):
+    def send(self, message):
+        self.sent += 1
+        return f"Sending SMS: {message}"
+
+
+class PushNotification(ChannelNotification):
+    def send(self, message):
+        self.sent += 1
+        return f"Sending PUSH: {message}"
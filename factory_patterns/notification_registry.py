@@ -0,0 +1,192 @@
+import importlib
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+class InstancePool:
+    """
+    Keeps up to max_idle built instances of one channel for reuse and never
+    lets more than max_size exist at once. Instances that fail is_healthy()
+    are closed and dropped instead of being handed out again.
+    """
+    def __init__(self, create, max_size=8, max_idle=None):
+        self.create = create
+        self.max_idle = max_size if max_idle is None else max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self.created = 0
+        self.discarded = 0
+
+    def acquire(self, timeout=None):
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("No notification instance available")
+        try:
+            while True:
+                with self._lock:
+                    instance = self._idle.pop() if self._idle else None
+                    if instance is None:
+                        self.created += 1
+                if instance is None:
+                    return self.create()
+                if instance.is_healthy():
+                    return instance
+                self._discard(instance)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, instance):
+        healthy = instance.is_healthy()
+        with self._lock:
+            keep = healthy and len(self._idle) < self.max_idle
+            if keep:
+                self._idle.append(instance)
+        if not keep:
+            self._discard(instance)
+        self._slots.release()
+
+    def _discard(self, instance):
+        with self._lock:
+            self.discarded += 1
+        close = getattr(instance, "close", None)
+        if close is not None:
+            close()
+
+    def close(self):
+        # Closes the idle instances, ones still handed out are closed when
+        # they come back and don't fit anymore
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self.max_idle = 0
+        for instance in idle:
+            self._discard(instance)
+
+
+class NotificationFactory:
+    # notification type -> class, or "module:Class" until first use
+    _registry = {}
+    _pools = {}
+    _lock = threading.Lock()
+    pool_size = 8
+
+    @classmethod
+    def register(cls, notification_type, target):
+        with cls._lock:
+            cls._registry[notification_type] = target
+            pool = cls._pools.pop(notification_type, None)
+        if pool is not None:
+            pool.close()
+
+    @classmethod
+    def register_channel(cls, notification_type):
+        # Decorator form for plugins: @NotificationFactory.register_channel("slack")
+        def decorator(channel_class):
+            cls.register(notification_type, channel_class)
+            return channel_class
+
+        return decorator
+
+    @classmethod
+    def get_class(cls, notification_type):
+        try:
+            target = cls._registry[notification_type]
+        except KeyError:
+            raise ValueError("Invalid Notification Type") from None
+        if isinstance(target, str):
+            # Lazy loading: the channel module is imported on first use only
+            module_name, class_name = target.split(":")
+            target = getattr(importlib.import_module(module_name), class_name)
+            with cls._lock:
+                cls._registry[notification_type] = target
+        return target
+
+    @classmethod
+    def create_notification(cls, notification_type):
+        return cls.get_class(notification_type)()
+
+    @classmethod
+    def get_pool(cls, notification_type):
+        pool = cls._pools.get(notification_type)
+        if pool is None:
+            channel_class = cls.get_class(notification_type)
+            with cls._lock:
+                pool = cls._pools.setdefault(notification_type, InstancePool(channel_class, cls.pool_size))
+        return pool
+
+    @classmethod
+    @contextmanager
+    def acquire(cls, notification_type, timeout=None):
+        pool = cls.get_pool(notification_type)
+        instance = pool.acquire(timeout)
+        try:
+            yield instance
+        finally:
+            pool.release(instance)
+
+
+NotificationFactory.register("email", "channels:EmailNotification")
+NotificationFactory.register("sms", "channels:SMSNotification")
+NotificationFactory.register("push", "channels:PushNotification")
+
+
+def benchmark(messages=2000, threads=8):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from channels import EmailNotification, PushNotification, SMSNotification
+
+    # The if/elif factory from notfity_w.py, building a notifier per message
+    def create_notification(notification_type):
+        if notification_type == "email":
+            return EmailNotification()
+        elif notification_type == "sms":
+            return SMSNotification()
+        elif notification_type == "push":
+            return PushNotification()
+        raise ValueError("Invalid Notification Type")
+
+    def send_new(i):
+        create_notification(("email", "sms", "push")[i % 3]).send(f"Order {i} placed")
+
+    def send_pooled(i):
+        with NotificationFactory.acquire(("email", "sms", "push")[i % 3]) as notifier:
+            notifier.send(f"Order {i} placed")
+
+    for name, send in (("if/elif, new per message", send_new), ("registry + pool", send_pooled)):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(send, range(messages)))
+        elapsed = time.perf_counter() - start
+        print(f"{name:<25} {messages / elapsed:10,.0f} notifications/sec")
+
+    for notification_type in ("email", "sms", "push"):
+        pool = NotificationFactory.get_pool(notification_type)
+        print(f"  {notification_type:<5} instances created={pool.created} discarded={pool.discarded}")
+
+
+# Client Code
+print("channels loaded before first use:", "channels" in sys.modules)
+with NotificationFactory.acquire("sms") as notifier:
+    print(notifier.send("ORder placed "))
+print("channels loaded after first use:", "channels" in sys.modules)
+
+with NotificationFactory.acquire("sms") as notifier:
+    notifier.close()  # a dropped connection fails the health check on release
+print("sms pool:", NotificationFactory.get_pool("sms").discarded, "discarded")
+
+
+@NotificationFactory.register_channel("slack")
+class SlackNotification:
+    def send(self, message):
+        return f"Sending SLACK: {message}"
+
+    def is_healthy(self):
+        return True
+
+
+with NotificationFactory.acquire("slack") as notifier:
+    print(notifier.send("Deploy finished"))
+
+benchmark()
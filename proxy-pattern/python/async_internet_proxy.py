@@ -0,0 +1,264 @@
+import asyncio
+import re
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import partial
+from urllib.parse import urlsplit
+
+
+# Interface -> same idea as InternetService in internet_proxy.py, but async
+class AsyncInternetService(ABC):
+    @abstractmethod
+    async def connect_to(self, url):
+        pass
+
+
+class Response:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def max_age(self):
+        # Only "Cache-Control: max-age=N" is honoured, no-store / no-cache win
+        cache_control = self.headers.get("cache-control", "").lower()
+        if "no-store" in cache_control or "no-cache" in cache_control:
+            return 0
+        match = re.search(r"max-age=(\d+)", cache_control)
+        return int(match.group(1)) if match else 0
+
+
+# Keeps a few open keep-alive connections per host and reuses them
+class ConnectionPool:
+    def __init__(self, max_per_host=10):
+        self.max_per_host = max_per_host
+        self._idle = {}
+        self._limits = {}
+
+    def _limit(self, host, port):
+        key = (host, port)
+        if key not in self._limits:
+            self._limits[key] = asyncio.Semaphore(self.max_per_host)
+            self._idle[key] = []
+        return self._limits[key], self._idle[key]
+
+    async def request(self, host, port, path):
+        limit, idle = self._limit(host, port)
+        async with limit:
+            while idle:
+                reader, writer = idle.pop()
+                try:
+                    response = await self._send(reader, writer, host, path)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    # Server dropped the idle connection, try the next one
+                    writer.close()
+                    continue
+                except BaseException:
+                    writer.close()
+                    raise
+                idle.append((reader, writer))
+                return response
+            reader, writer = await asyncio.open_connection(host, port)
+            try:
+                response = await self._send(reader, writer, host, path)
+            except BaseException:
+                # Half-read or cancelled, the connection can't be reused
+                writer.close()
+                raise
+            idle.append((reader, writer))
+            return response
+
+    async def _send(self, reader, writer, host, path):
+        writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n\r\n".encode()
+        )
+        await writer.drain()
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split()[1])
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        body = await reader.readexactly(int(headers.get("content-length", 0)))
+        return Response(status, headers, body)
+
+    async def close(self):
+        for idle in self._idle.values():
+            for _, writer in idle:
+                writer.close()
+                await writer.wait_closed()
+            idle.clear()
+
+
+# Real Object
+class AsyncInternet(AsyncInternetService):
+    def __init__(self, pool=None):
+        self.pool = pool or ConnectionPool()
+
+    async def connect_to(self, url):
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        return await self.pool.request(parts.hostname, parts.port or 80, path)
+
+
+# LRU bounded by total body size, entries expire after their max-age
+class ResponseCache:
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, url):
+        entry = self._entries.get(url)
+        if entry is None:
+            self.misses += 1
+            return None
+        response, expires_at = entry
+        if expires_at < time.monotonic():
+            self._remove(url)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(url)
+        self.hits += 1
+        return response
+
+    def put(self, url, response):
+        max_age = response.max_age()
+        if response.status != 200 or max_age <= 0 or len(response.body) > self.max_bytes:
+            return
+        if url in self._entries:
+            self._remove(url)
+        self._entries[url] = (response, time.monotonic() + max_age)
+        self.size += len(response.body)
+        while self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, url):
+        response, _ = self._entries.pop(url)
+        self.size -= len(response.body)
+
+    def hit_ratio(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+# Proxy: banned list + cache + request coalescing in front of AsyncInternet
+class AsyncProxyService(AsyncInternetService):
+    def __init__(self, internet=None, cache=None):
+        self.banned_list = ["www.thepiratebay.org"]
+        self.internet = internet or AsyncInternet()  # Real Object - Aggregation
+        self.cache = cache or ResponseCache()
+        self._in_flight = {}
+
+    async def connect_to(self, url):
+        if urlsplit(url).hostname in self.banned_list:
+            raise Exception("can't connect to banned websites")
+        response = self.cache.get(url)
+        if response is not None:
+            return response
+        # Concurrent misses for the same URL share one upstream fetch. It
+        # runs in its own task, a caller that is cancelled or times out
+        # stops waiting for it but does not stop it for the others
+        task = self._in_flight.get(url)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._fetch(url))
+            task.add_done_callback(partial(self._fetched, url))
+            self._in_flight[url] = task
+        return await asyncio.shield(task)
+
+    async def _fetch(self, url):
+        response = await self.internet.connect_to(url)
+        self.cache.put(url, response)
+        return response
+
+    def _fetched(self, url, task):
+        if self._in_flight.get(url) is task:
+            del self._in_flight[url]
+        if not task.cancelled():
+            task.exception()  # mark as retrieved when nobody else waits
+
+
+# Local stub upstream server, counts how many requests really reached it
+class StubUpstream:
+    def __init__(self, delay=0.005, max_age=60):
+        self.delay = delay
+        self.max_age = max_age
+        self.requests = 0
+        self.server = None
+        self.port = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                path = head.split(b" ", 2)[1]
+                self.requests += 1
+                await asyncio.sleep(self.delay)
+                body = b"content of " + path
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    + f"Content-Length: {len(body)}\r\n".encode()
+                    + f"Cache-Control: max-age={self.max_age}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def stop(self):
+        await asyncio.sleep(0)  # let handlers see the closed connections
+        self.server.close()
+        await self.server.wait_closed()
+
+
+# Client code
+async def client_code(total_requests=5000, distinct_urls=100, concurrency=200):
+    upstream = StubUpstream()
+    await upstream.start()
+    proxy = AsyncProxyService()
+    urls = [
+        f"http://127.0.0.1:{upstream.port}/page/{i % distinct_urls}"
+        for i in range(total_requests)
+    ]
+
+    queue = asyncio.Queue()
+    for url in urls:
+        queue.put_nowait(url)
+
+    async def worker():
+        while not queue.empty():
+            await proxy.connect_to(queue.get_nowait())
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    print(f"Requests      : {total_requests}")
+    print(f"Requests/sec  : {total_requests / elapsed:.0f}")
+    print(f"Cache hit     : {proxy.cache.hit_ratio():.2%}")
+    print(f"Upstream hits : {upstream.requests}")
+
+    try:
+        await proxy.connect_to("http://www.thepiratebay.org/")
+    except Exception as exc:
+        print(exc)
+
+    await proxy.internet.pool.close()
+    await upstream.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(client_code())
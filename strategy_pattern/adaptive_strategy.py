@@ -0,0 +1,167 @@
+import random
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PaymentStrategy(ABC):
+
+    @abstractmethod
+    def pay(self, amount):
+        pass
+
+
+class StrategyStats:
+    """
+    Exponentially decaying latency and error rate of one strategy.
+    Updates are plain attribute writes, two threads racing on the same
+    strategy can lose one sample, which the decay absorbs anyway.
+    """
+    def __init__(self, decay):
+        self.decay = decay
+        self.latency = None
+        self.error_rate = 0.0
+        self.calls = 0
+
+    def record(self, latency, failed):
+        self.calls += 1
+        self.latency = latency if self.latency is None else self.latency + self.decay * (latency - self.latency)
+        self.error_rate += self.decay * ((1.0 if failed else 0.0) - self.error_rate)
+
+    def score(self, error_cost):
+        # Lower is better, untried strategies go first. Errors are added as
+        # seconds, a route that fails fast must not look like a fast route
+        if self.latency is None:
+            return 0.0
+        return self.latency + error_cost * self.error_rate
+
+
+class AdaptivePaymentProcessor:
+    """
+    Routes each payment to the strategy with the best decayed latency and
+    error rate, and sends an explore share of traffic to a random other
+    one so a recovering route gets noticed. The current best is a single
+    attribute read on the hot path, recomputed after every call and
+    swapped with one assignment, no locks. error_cost is what a failed
+    call costs the caller in seconds, on top of the time it took.
+    """
+    def __init__(self, strategies, explore=0.05, decay=0.1, error_cost=0.05):
+        self.strategies = list(strategies)
+        self.stats = {strategy: StrategyStats(decay) for strategy in self.strategies}
+        self.explore = explore
+        self.error_cost = error_cost
+        self.best = self.strategies[0]
+
+    def choose(self):
+        if random.random() < self.explore:
+            return random.choice(self.strategies)
+        return self.best
+
+    def _record(self, strategy, latency, failed):
+        self.stats[strategy].record(latency, failed)
+        self.best = min(self.strategies, key=lambda s: self.stats[s].score(self.error_cost))
+
+    def process(self, amount):
+        # A failure is recorded and re-raised, never retried here: a timed
+        # out charge may still have gone through, retrying is the caller's call
+        strategy = self.choose()
+        start = time.perf_counter()
+        try:
+            result = strategy.pay(amount)
+        except Exception:
+            self._record(strategy, time.perf_counter() - start, True)
+            raise
+        self._record(strategy, time.perf_counter() - start, False)
+        return result
+
+
+# Stand-in gateway routes with different latency and reliability
+class GatewayRoute(PaymentStrategy):
+    def __init__(self, name, latency, error_rate=0.0):
+        self.name = name
+        self.latency = latency
+        self.error_rate = error_rate
+
+    def pay(self, amount):
+        time.sleep(random.expovariate(1 / self.latency))
+        if random.random() < self.error_rate:
+            raise ConnectionError(f"{self.name} timed out")
+        return f"Paid {amount} using {self.name}"
+
+    def __repr__(self):
+        return self.name
+
+
+class RoundRobinProcessor:
+    def __init__(self, strategies):
+        self.strategies = strategies
+        self.next = 0
+
+    def process(self, amount):
+        strategy = self.strategies[self.next % len(self.strategies)]
+        self.next += 1
+        return strategy.pay(amount)
+
+
+def run(processor, payments, threads, routes, degrade_at):
+    latencies = []
+    failures = 0
+
+    def pay(i):
+        nonlocal failures
+        if i == degrade_at:
+            routes[0].latency, routes[0].error_rate = 0.004, 0.2  # fastest route degrades
+        start = time.perf_counter()
+        try:
+            processor.process(100 + i)
+        except ConnectionError:
+            failures += 1
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(pay, range(payments)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return payments / elapsed, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)], failures
+
+
+def benchmark(payments=3000, threads=8):
+    def make_routes():
+        return [
+            GatewayRoute("route-a", 0.0005, 0.01),
+            GatewayRoute("route-b", 0.0015, 0.01),
+            GatewayRoute("route-c", 0.003, 0.05),
+        ]
+
+    print(f"{payments} payments, route-a degrades after {payments // 2}")
+    for name, factory in (
+        ("fixed route-b", lambda routes: AdaptivePaymentProcessor([routes[1]], explore=0)),
+        ("round robin", RoundRobinProcessor),
+        ("adaptive", AdaptivePaymentProcessor),
+    ):
+        routes = make_routes()
+        processor = factory(routes)
+        throughput, p50, p99, failures = run(processor, payments, threads, routes, payments // 2)
+        print(f"{name:<14} {throughput:7,.0f} payments/sec  p50={p50 * 1000:.2f}ms "
+              f"p99={p99 * 1000:.2f}ms failures={failures}")
+        if isinstance(processor, AdaptivePaymentProcessor) and len(processor.strategies) > 1:
+            for route, stats in processor.stats.items():
+                print(f"  {route.name}: calls={stats.calls} latency={stats.latency * 1000:.2f}ms "
+                      f"errors={stats.error_rate:.1%}")
+
+    # A route that fails instantly is the quickest to answer, it must still lose
+    routes = [GatewayRoute("dead", 0.00001, 1.0), GatewayRoute("healthy", 0.001)]
+    processor = AdaptivePaymentProcessor(routes)
+    throughput, p50, p99, failures = run(processor, 500, threads, routes, None)
+    print(f"dead route     {throughput:7,.0f} payments/sec  failures={failures}/500 "
+          f"dead calls={processor.stats[routes[0]].calls} best={processor.best}")
+
+
+# Usage
+processor = AdaptivePaymentProcessor([GatewayRoute("route-a", 0.001), GatewayRoute("route-b", 0.002)])
+for amount in (500, 20, 1200):
+    print(processor.process(amount))
+print("current best:", processor.best)
+
+benchmark()
@@ -0,0 +1,212 @@
+import asyncio
+import random
+import time
+from abc import ABC, abstractmethod
+
+
+class AsyncPaymentStrategy(ABC):
+    """
+    Same shape as PaymentStrategy, but pay() is a coroutine talking to the
+    gateway. Each strategy owns a few keep-alive connections, the semaphore
+    caps how many payments of this kind are in flight at once.
+    """
+    def __init__(self, host, port, max_concurrency=8, timeout=1.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._limit = asyncio.Semaphore(max_concurrency)
+        self._idle = []
+        self.connections = 0
+
+    @property
+    @abstractmethod
+    def method(self):
+        pass
+
+    async def pay(self, amount):
+        async with self._limit:
+            reader, writer = self._idle.pop() if self._idle else await self._connect()
+            try:
+                writer.write(f"CHARGE {self.method} {amount}\n".encode())
+                await writer.drain()
+                reply = await asyncio.wait_for(reader.readline(), self.timeout)
+            except BaseException:
+                # A timed out connection may still get its reply later, never reuse it
+                writer.close()
+                raise
+            if not reply:
+                writer.close()
+                raise ConnectionError(f"{self.method} gateway closed the connection")
+            self._idle.append((reader, writer))
+        status, _, detail = reply.decode().strip().partition(" ")
+        if status != "OK":
+            raise RuntimeError(f"{self.method} payment of {amount} declined: {detail}")
+        return f"Paid {amount} using {self.method}"
+
+    async def _connect(self):
+        self.connections += 1
+        return await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+            await writer.wait_closed()
+
+
+class AsyncCreditCardPayment(AsyncPaymentStrategy):
+    method = "credit_card"
+
+
+class AsyncUPIPayment(AsyncPaymentStrategy):
+    method = "upi"
+
+
+class AsyncCashPayment(AsyncPaymentStrategy):
+    method = "cash"
+
+
+class AsyncPaymentProcessor:
+
+    def __init__(self, strategy: AsyncPaymentStrategy) -> None:
+        self.strategy = strategy
+
+    async def process(self, amount):
+        return await self.strategy.pay(amount)
+
+
+async def process_many(records, strategies):
+    """
+    Runs every (method, amount) record concurrently, the per-strategy
+    semaphores keep each gateway within its limit. Returns receipts in
+    input order, a failed payment shows up as its exception.
+    """
+    by_method = {strategy.method: strategy for strategy in strategies}
+    return await asyncio.gather(
+        *(by_method[method].pay(amount) for method, amount in records),
+        return_exceptions=True,
+    )
+
+
+# Local stand-in for the payment gateway: one reply line per CHARGE line,
+# after a random delay that simulates the provider's processing time
+class StubGatewayServer:
+    def __init__(self, latency=0.005, jitter=0.003, decline_rate=0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.decline_rate = decline_rate
+        self.charges = 0
+        self.server = None
+        self.port = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def _handle(self, reader, writer):
+        try:
+            while line := await reader.readline():
+                self.charges += 1
+                await asyncio.sleep(self.latency + random.uniform(0, self.jitter))
+                if random.random() < self.decline_rate:
+                    writer.write(b"DECLINED insufficient funds\n")
+                else:
+                    writer.write(b"OK " + line.split()[-1] + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+async def benchmark(payments=5000, sequential_payments=200):
+    gateway = StubGatewayServer()
+    await gateway.start()
+    records = [(("credit_card", "upi", "cash")[i % 3], 100 + i % 900) for i in range(payments)]
+
+    def make_strategies():
+        return [
+            AsyncCreditCardPayment("127.0.0.1", gateway.port, max_concurrency=32),
+            AsyncUPIPayment("127.0.0.1", gateway.port, max_concurrency=64),
+            AsyncCashPayment("127.0.0.1", gateway.port, max_concurrency=16),
+        ]
+
+    async def timed(strategy, amount, latencies):
+        start = time.perf_counter()
+        try:
+            return await strategy.pay(amount)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    def report(name, count, elapsed, latencies):
+        latencies.sort()
+        print(f"{name:<12} {count / elapsed:8,.0f} payments/sec  "
+              f"p50={percentile(latencies, 0.5) * 1000:6.2f}ms  p99={percentile(latencies, 0.99) * 1000:6.2f}ms")
+
+    print(f"gateway latency {gateway.latency * 1000:.0f}-{(gateway.latency + gateway.jitter) * 1000:.0f}ms")
+
+    # Before: one payment after another, like PaymentProcessor.process in a loop
+    strategies = make_strategies()
+    by_method = {strategy.method: strategy for strategy in strategies}
+    latencies = []
+    start = time.perf_counter()
+    for method, amount in records[:sequential_payments]:
+        await timed(by_method[method], amount, latencies)
+    report("sequential", sequential_payments, time.perf_counter() - start, latencies)
+    for strategy in strategies:
+        await strategy.close()
+
+    strategies = make_strategies()
+    by_method = {strategy.method: strategy for strategy in strategies}
+    latencies = []
+    start = time.perf_counter()
+    receipts = await asyncio.gather(
+        *(timed(by_method[method], amount, latencies) for method, amount in records),
+        return_exceptions=True,
+    )
+    # All payments are submitted at once, so latency here includes the wait
+    # for a free connection behind each strategy's semaphore
+    report("concurrent", payments, time.perf_counter() - start, latencies)
+    failures = sum(isinstance(receipt, Exception) for receipt in receipts)
+    print(f"  failures={failures}  connections opened: "
+          + ", ".join(f"{strategy.method}={strategy.connections}" for strategy in strategies))
+    for strategy in strategies:
+        await strategy.close()
+
+    await gateway.stop()
+
+
+async def client_code():
+    gateway = StubGatewayServer(latency=0.01, jitter=0)
+    await gateway.start()
+
+    upi = AsyncUPIPayment("127.0.0.1", gateway.port)
+    processor = AsyncPaymentProcessor(upi)
+    print(await processor.process(500))
+
+    # Timeout: a 10ms gateway against a 5ms budget
+    impatient = AsyncCreditCardPayment("127.0.0.1", gateway.port, timeout=0.005)
+    try:
+        await impatient.pay(1200)
+    except asyncio.TimeoutError:
+        print("credit_card payment timed out")
+
+    cash = AsyncCashPayment("127.0.0.1", gateway.port)
+    for receipt in await process_many([("upi", 20), ("cash", 75), ("upi", 300)], [upi, cash]):
+        print(receipt)
+
+    for strategy in (upi, impatient, cash):
+        await strategy.close()
+    await gateway.stop()
+
+
+asyncio.run(client_code())
+asyncio.run(benchmark())
@@ -0,0 +1,146 @@
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+
+class PaymentStrategy(ABC):
+    # Stand-in for the gateway: each call costs a round trip,
+    # each amount in it a little more
+    CALL_COST = 0.0005
+    ITEM_COST = 0.000002
+
+    @property
+    @abstractmethod
+    def name(self):
+        pass
+
+    def pay(self, amount):
+        return self.pay_many([amount])[0]
+
+    def pay_many(self, amounts):
+        time.sleep(self.CALL_COST + self.ITEM_COST * len(amounts))
+        return [f"Paid {amount} using {self.name}" for amount in amounts]
+
+
+class CreditCardPayment(PaymentStrategy):
+    name = "credit_card"
+
+
+class UPIPayment(PaymentStrategy):
+    name = "upi"
+
+
+class CashPayment(PaymentStrategy):
+    name = "cash"
+
+
+class PaymentProcessor:
+
+    def __init__(self, strategy: PaymentStrategy) -> None:
+        self.strategy = strategy
+
+    def process(self, amount):
+        return self.strategy.pay(amount)
+
+
+class BatchPaymentProcessor:
+    """
+    Takes a stream of (payment_type, amount) records, cuts it into windows
+    of batch_size, groups every window by strategy and sends each group to
+    strategy.pay_many in a worker pool. Receipts come back in input order,
+    at most max_pending windows are in flight.
+
+    A record that could not be paid gets the exception in its place instead
+    of a receipt: a ValueError for an unknown payment type, or whatever its
+    group's pay_many raised. Other groups and windows are not affected.
+    """
+    def __init__(self, strategies, batch_size=1000, workers=4, max_pending=4):
+        self.strategies = {strategy.name: strategy for strategy in strategies}
+        self.batch_size = batch_size
+        self.workers = workers
+        self.max_pending = max_pending
+
+    def _submit(self, pool, window):
+        receipts = [None] * len(window)
+        groups = {}
+        for position, (payment_type, amount) in enumerate(window):
+            if payment_type not in self.strategies:
+                receipts[position] = ValueError(f"Unsupported payment type {payment_type!r}")
+                continue
+            positions, amounts = groups.setdefault(payment_type, ([], []))
+            positions.append(position)
+            amounts.append(amount)
+        futures = [
+            (positions, pool.submit(self.strategies[payment_type].pay_many, amounts))
+            for payment_type, (positions, amounts) in groups.items()
+        ]
+        return receipts, futures
+
+    @staticmethod
+    def _collect(receipts, futures):
+        for positions, future in futures:
+            try:
+                results = future.result()
+            except Exception as error:
+                results = [error] * len(positions)
+            for position, receipt in zip(positions, results):
+                receipts[position] = receipt
+        return receipts
+
+    def process(self, records):
+        records = iter(records)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending = deque()
+            while True:
+                try:
+                    window = list(islice(records, self.batch_size))
+                except Exception:
+                    # The input broke, hand back what was already sent first
+                    while pending:
+                        yield from self._collect(*pending.popleft())
+                    raise
+                if not window:
+                    break
+                pending.append(self._submit(pool, window))
+                if len(pending) >= self.max_pending:
+                    yield from self._collect(*pending.popleft())
+            while pending:
+                yield from self._collect(*pending.popleft())
+
+
+def payment_file(count):
+    types = ("credit_card", "upi", "cash")
+    for i in range(count):
+        yield types[i % 3], 100 + i % 900
+
+
+def benchmark(records=20_000):
+    strategies = [CreditCardPayment(), UPIPayment(), CashPayment()]
+    by_name = {strategy.name: strategy for strategy in strategies}
+
+    start = time.perf_counter()
+    for payment_type, amount in payment_file(records):
+        PaymentProcessor(by_name[payment_type]).process(amount)
+    per_call = records / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    count = sum(1 for _ in BatchPaymentProcessor(strategies).process(payment_file(records)))
+    batch = count / (time.perf_counter() - start)
+
+    print(f"{records:,} payment records")
+    print(f"per-call loop   : {per_call:10,.0f} records/sec")
+    print(f"batch processor : {batch:10,.0f} records/sec")
+
+
+# Usage
+upi = UPIPayment()
+processor = PaymentProcessor(upi)
+print(processor.process(500))
+
+batch_processor = BatchPaymentProcessor([CreditCardPayment(), UPIPayment(), CashPayment()], batch_size=3)
+for receipt in batch_processor.process([("upi", 500), ("cash", 20), ("credit_card", 1200), ("upi", 75)]):
+    print(receipt)
+
+benchmark()